@@ -1,15 +1,25 @@
 # qa_engine.py
-import requests
 import pandas as pd
 import duckdb
 import re
 import json
+import os
+import threading
+from collections import OrderedDict
+from data_processor import DataProcessor, normalize_rainfall, normalize_crop
+from http_cache import get_client
+from questions import SUGGESTED_QUESTIONS
+from time_series import TimeSeriesIndex
+from sketches import ApproximateIndex
 API_KEY = "579b464db66ec23bdd000001eda4e5e8416a4ed1580558119b11c1cc"  # <-- replace with your actual data.gov.in API key
 
 # Load dataset metadata
 with open("datasets_info.json") as f:
     DATASETS = json.load(f)
 
+# Directory holding the local CSVs; point SAMARTH_DATA_DIR elsewhere to run on other (e.g. scaled) copies
+DATA_DIR = os.environ.get("SAMARTH_DATA_DIR", os.path.dirname(os.path.abspath(__file__)))
+
 def fetch_resource(resource_id, limit=10000):
     """Fetch dataset from data.gov.in using API or local file for crop data"""
     # Use the correct key for crop data
@@ -18,8 +28,7 @@ def fetch_resource(resource_id, limit=10000):
     if resource_id == crop_resource_id:
         try:
             # Always load from crop_yield.csv for crop_production
-            import os
-            csv_path = os.path.join(os.path.dirname(__file__), "crop_yield.csv")
+            csv_path = os.path.join(DATA_DIR, "crop_yield.csv")
             data = pd.read_csv(csv_path)
             return data
         except Exception as e:
@@ -27,140 +36,520 @@ def fetch_resource(resource_id, limit=10000):
             return pd.DataFrame()
     if resource_id == rainfall_resource_id:
         try:
-            import os
-            csv_path = os.path.join(os.path.dirname(__file__), "rainfall_data.csv")
+            csv_path = os.path.join(DATA_DIR, "rainfall_data.csv")
             data = pd.read_csv(csv_path)
             return data
         except Exception as e:
             print(f"Error loading rainfall_data.csv: {e}")
             return pd.DataFrame()
     # Otherwise, use the API for other datasets
-    url = f"https://api.data.gov.in/resource/{resource_id}"
     params = {"api-key": API_KEY, "format": "json", "limit": limit}
-    r = requests.get(url, params=params)
-    r.raise_for_status()
-    data = r.json()
+    data = get_client().get_json(resource_id, params)
     return pd.DataFrame(data["records"])
 
 # ------------------ Normalization Helpers -------------------
 
-def normalize_rainfall(df):
-    """Convert monthly rainfall columns to annual"""
-    df = df.rename(columns=str.lower)
-    month_cols = [c for c in df.columns if any(m in c for m in [
-        "jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"
-    ])]
-    if month_cols:
-        for c in month_cols:
-            df[c] = pd.to_numeric(df[c], errors="coerce")
-        df["annual_mm"] = df[month_cols].sum(axis=1)
-    if "state" not in df.columns:
-        if "subdivision" in df.columns:
-            df["state"] = df["subdivision"]
-    df["year"] = pd.to_numeric(df["year"] if "year" in df.columns else df["yr"], errors="coerce")
-    return df[["state", "year", "annual_mm"]].dropna()
-
-def normalize_crop(df):
-    """Standardize crop production data, accepting crop_yield.csv structure"""
-    df = df.rename(columns=str.lower)
-    # Use crop_year as year if year is missing
-    if "year" not in df.columns and "crop_year" in df.columns:
-        df["year"] = df["crop_year"]
-    required_cols = ["state", "crop", "year", "production"]
-    # Early exit if DataFrame is empty
+# Station names in the wide station-event sheets mapped to the states used by
+# the rainfall and crop datasets, so station rows can join on (state, year).
+STATION_STATES = {
+    "Ahmedabad": "Gujarat",
+    "Amritsar": "Punjab",
+    "Bahraich": "Uttar Pradesh",
+    "Bhagalpur": "Bihar",
+    "Fatehpur": "Uttar Pradesh",
+    "Gaya": "Bihar",
+    "Gazipur": "Uttar Pradesh",
+    "Guwahati": "Assam",
+    "Hamirpur": "Uttar Pradesh",
+    "Hardoi": "Uttar Pradesh",
+    "Hissar": "Haryana",
+    "Lucknow": "Uttar Pradesh",
+    "Mednapur": "West Bengal",
+    "Ayanagar (New Delhi)": "Delhi",
+    "New Delhi (Palam)": "Delhi",
+    "Safdarjung (New Delhi)": "Delhi",
+    "Patiala": "Punjab",
+    "Patna": "Bihar",
+    "Shahjahanpur": "Uttar Pradesh",
+}
+
+YEAR_COLUMN_RE = re.compile(r"^(19|20)\d{2}$")
+
+def find_year_columns(df):
+    """Return the columns whose header is a 4-digit year (wide year-as-column layout)"""
+    return [c for c in df.columns if YEAR_COLUMN_RE.match(str(c).strip())]
+
+def melt_year_columns(df, id_col, value_name="value"):
+    """Reshape a wide sheet with one column per year into typed (id, year, value) rows"""
+    year_cols = find_year_columns(df)
+    if len(year_cols) < 2:
+        raise ValueError(f"Expected at least two year columns, found: {year_cols}")
+    long_df = df.melt(id_vars=[id_col], value_vars=year_cols, var_name="year", value_name=value_name)
+    long_df["year"] = long_df["year"].astype(str).str.strip().astype(int)
+    long_df[value_name] = pd.to_numeric(long_df[value_name], errors="coerce")
+    return long_df.dropna(subset=[value_name])
+
+def normalize_station_events(df):
+    """Melt the station-wise event sheet into (station, state, year, events) rows"""
     if df.empty:
-        raise KeyError("Crop data file returned no records. Please check the CSV file and its path.")
-    col_map = {
-        "state": ["state", "subdivision"],
-        "crop": ["crop", "commodity"],
-        "year": ["year", "crop_year", "yr"],
-        "production": ["production", "production_tonnes", "prod_tonnes", "modal_price", "max_price"]
-    }
-    for key, alternatives in col_map.items():
-        for alt in alternatives:
-            if alt in df.columns:
-                df[key] = df[alt]
-                break
-    # If district exists, include it as a column
-    if "district" in df.columns:
-        required_cols.insert(1, "district")
-    missing = [c for c in required_cols if c not in df.columns]
-    if missing:
-        raise KeyError(f"Missing columns in crop data: {missing}. Available columns: {df.columns.tolist()}")
-    df["production"] = pd.to_numeric(df["production"], errors="coerce")
-    df["year"] = pd.to_numeric(df["year"], errors="coerce")
-    return df[required_cols].dropna()
+        raise KeyError("Station event file returned no records. Please check the CSV file and its path.")
+    station_col = next((c for c in df.columns if "station" in c.lower()), None)
+    if station_col is None:
+        raise KeyError(f"Missing station column in station data. Available columns: {df.columns.tolist()}")
+    df = df.copy()
+    # Collapse stray whitespace such as "Safdarjung (New Delhi )"
+    df[station_col] = (df[station_col].astype(str)
+                       .str.replace(r"\s+", " ", regex=True)
+                       .str.replace(" )", ")", regex=False)
+                       .str.strip())
+    # Drop footer rows like "Total Number of Events"
+    df = df[~df[station_col].str.lower().str.startswith("total")]
+    long_df = melt_year_columns(df, station_col, value_name="events")
+    long_df = long_df.rename(columns={station_col: "station"})
+    long_df["state"] = long_df["station"].map(STATION_STATES)
+    unmapped = sorted(long_df.loc[long_df["state"].isna(), "station"].unique())
+    if unmapped:
+        print(f"Warning: no state mapping for stations {unmapped}; add them to STATION_STATES to join them with state data.")
+    long_df["events"] = long_df["events"].astype(int)
+    return long_df[["station", "state", "year", "events"]].reset_index(drop=True)
 
-# ------------------ Core Analytics -------------------
+def load_station_events():
+    """Load and normalize the local station-wise event dataset"""
+    csv_path = os.path.join(DATA_DIR, DATASETS["station_events"]["file"])
+    return normalize_station_events(pd.read_csv(csv_path))
 
-def compare_rainfall_and_crops(state_x, state_y, crop_type=None, years=5):
-    rain = normalize_rainfall(fetch_resource(DATASETS["rainfall"]["resource_id"]))
-    crop = normalize_crop(fetch_resource(DATASETS["crop_production"]["resource_id"]))
-
-    con = duckdb.connect(":memory:")
-    con.register("rain", rain)
-    con.register("crop", crop)
-
-    # Ensure rain['year'] is not empty/all-NA to avoid ValueError
-    if rain["year"].dropna().empty:
-        raise ValueError("Rainfall data contains no valid years. Please check your rainfall dataset.")
-    max_year_value = rain["year"].max()
-    if pd.isna(max_year_value):
-        raise ValueError("Rainfall data has NaN as the maximum year. Please verify your data file.")
-    max_year = int(max_year_value)
-    min_year = max_year - years + 1
+# ------------------ Ingested Tables -------------------
+
+LOCAL_DATA_FILES = ["crop_yield.csv", "rainfall_data.csv", DATASETS["station_events"]["file"]]
+
+_warehouse = {"version": None, "con": None, "series": None, "approx": None}
+_warehouse_lock = threading.Lock()
+
+def dataset_version():
+    """Short fingerprint of the local data files; changes whenever any file is replaced or edited"""
+    import hashlib
+    digest = hashlib.sha1()
+    for name in LOCAL_DATA_FILES:
+        path = os.path.join(DATA_DIR, name)
+        try:
+            st = os.stat(path)
+            digest.update(f"{name}:{st.st_size}:{st.st_mtime_ns};".encode())
+        except OSError:
+            digest.update(f"{name}:missing;".encode())
+    return digest.hexdigest()[:12]
+
+def _current_warehouse():
+    """Return the warehouse snapshot for the current dataset version, rebuilding it when stale.
+
+    Tables are built once per version: wide sheets are melted, the station
+    table is indexed on (station, year), DataProcessor's rainfall x crop fact
+    table is stored sorted and indexed on (state, year) for range scans, and
+    prefix-sum time series are kept for state rainfall and (state, crop) production,
+    and stratified samples plus t-digests back the approximate query mode.
+    """
+    global _warehouse
+    version = dataset_version()
+    with _warehouse_lock:
+        if _warehouse["con"] is not None and _warehouse["version"] == version:
+            return _warehouse
+        processor = DataProcessor()
+        rain = processor.standardize_climate_data(fetch_resource(DATASETS["rainfall"]["resource_id"]))
+        crop = processor.standardize_agriculture_data(fetch_resource(DATASETS["crop_production"]["resource_id"]))
+        fact = processor.merge_datasets()
+        stations = load_station_events()
+
+        con = duckdb.connect(":memory:")
+        con.register("rain_src", rain)
+        con.register("crop_src", crop)
+        con.register("fact_src", fact)
+        con.register("station_src", stations)
+        con.execute("CREATE TABLE rain AS SELECT * FROM rain_src")
+        con.execute("CREATE TABLE crop AS SELECT * FROM crop_src")
+        con.execute("""
+            CREATE TABLE rain_crop_fact AS
+            SELECT state, CAST(year AS INTEGER) AS year, crop, production, area, yield, annual_mm
+            FROM fact_src
+            ORDER BY state, year, crop NULLS FIRST
+        """)
+        con.execute("CREATE INDEX idx_rain_crop_fact ON rain_crop_fact (state, year)")
+        con.execute("""
+            CREATE TABLE station_events AS
+            SELECT station, state, CAST(year AS INTEGER) AS year, CAST(events AS INTEGER) AS events
+            FROM station_src
+            ORDER BY station, year
+        """)
+        con.execute("CREATE INDEX idx_station_events ON station_events (station, year)")
+        con.execute("""
+            CREATE TABLE crop_state_year AS
+            SELECT state, CAST(year AS INTEGER) AS year, SUM(production) AS total_prod
+            FROM crop
+            GROUP BY state, year
+            ORDER BY state, year
+        """)
+        con.execute("CREATE INDEX idx_crop_state_year ON crop_state_year (state, year)")
+        # Additive sums for every combination of (state, crop, season, year); ratios
+        # such as fertilizer per hectare are derived from these at query time
+        con.execute("""
+            CREATE TABLE yield_cube AS
+            SELECT state, crop, season, CAST(year AS INTEGER) AS year,
+                   CAST(GROUPING(state, crop, season, year) AS INTEGER) AS grouping_id,
+                   COUNT(*) AS n_rows,
+                   SUM(production) AS production,
+                   SUM(area) AS area,
+                   SUM(fertilizer) AS fertilizer,
+                   SUM(pesticide) AS pesticide,
+                   SUM(yield * area) AS yield_area
+            FROM crop
+            GROUP BY CUBE (state, crop, season, year)
+            ORDER BY grouping_id, state, crop, season, year
+        """)
+        con.execute("CREATE INDEX idx_yield_cube ON yield_cube (grouping_id, state, crop, season, year)")
+        for name in ("rain_src", "crop_src", "fact_src", "station_src"):
+            con.unregister(name)
+        series = {
+            "rain": TimeSeriesIndex(rain, "state", "annual_mm"),
+            "crop": TimeSeriesIndex(crop, ["state", "crop"], "production"),
+            "state_prod": TimeSeriesIndex(crop, "state", "production"),
+        }
+        _warehouse = {"version": version, "con": con, "series": series, "approx": ApproximateIndex(crop)}
+        return _warehouse
+
+def get_warehouse():
+    """Return the DuckDB connection holding the ingested tables"""
+    return _current_warehouse()["con"]
+
+def get_time_series():
+    """Return the prefix-sum time series: "rain" by state, "crop" by (state, crop), "state_prod" by state"""
+    return _current_warehouse()["series"]
+
+def get_approximate_index():
+    """Return the stratified samples and sketches used when answering approximately"""
+    return _current_warehouse()["approx"]
+
+_vocabulary = {"version": None, "vocabulary": None}
+
+def get_vocabulary():
+    """Return the state and crop names known to the local datasets.
+
+    Only the name columns of the CSVs are read (once per dataset version), so
+    questions can be parsed and their entities shown before the warehouse is built.
+    """
+    global _vocabulary
+    version = dataset_version()
+    if _vocabulary["version"] != version:
+        def names(filename, columns):
+            try:
+                df = pd.read_csv(os.path.join(DATA_DIR, filename), usecols=lambda c: c.lower() in columns)
+            except Exception as e:
+                print(f"Error reading names from {filename}: {e}")
+                return {}
+            return {c.lower(): set(df[c].dropna().astype(str).str.strip()) for c in df.columns}
+        crop = names("crop_yield.csv", ("state", "crop"))
+        rain = names("rainfall_data.csv", ("state", "subdivision"))
+        vocabulary = {
+            "states": sorted(crop.get("state", set()) | rain.get("state", rain.get("subdivision", set()))),
+            "crops": sorted(crop.get("crop", set())),
+        }
+        _vocabulary = {"version": version, "vocabulary": vocabulary}
+    return _vocabulary["vocabulary"]
+
+CUBE_DIMENSIONS = ("state", "crop", "season", "year")
 
-    rainfall_query = f"""
-        SELECT state, AVG(annual_mm) AS avg_rain
-        FROM rain
-        WHERE year BETWEEN {min_year} AND {max_year}
-          AND state IN ('{state_x}', '{state_y}')
-        GROUP BY state
+# Measures derived from the cube's additive sums
+CUBE_MEASURES = {
+    "production_per_ha": "SUM(production) / NULLIF(SUM(area), 0)",
+    "fertilizer_per_ha": "SUM(fertilizer) / NULLIF(SUM(area), 0)",
+    "pesticide_per_ha": "SUM(pesticide) / NULLIF(SUM(area), 0)",
+    "yield": "SUM(yield_area) / NULLIF(SUM(area), 0)",
+    "production_per_fertilizer": "SUM(production) / NULLIF(SUM(fertilizer), 0)",
+}
+
+def query_yield_cube(by=(), state=None, crop=None, season=None, min_year=None, max_year=None, measures=None,
+                     order_by=None, descending=True):
+    """Slice, dice or drill down the yield/input-efficiency cube.
+
+    `by` lists the dimensions to break results out by (drill-down); the
+    other arguments filter (slice/dice), and state, crop or season may be a
+    list to keep several values. Rows are ordered by `by` unless `order_by`
+    names a measure. Reads only the precomputed cube cells at the matching
+    grouping level, never the raw crop rows.
+    """
+    by = [d for d in CUBE_DIMENSIONS if d in by]
+    filters = {"state": state, "crop": crop, "season": season}
+    year_filtered = min_year is not None or max_year is not None
+    kept = set(by) | {d for d, v in filters.items() if v is not None}
+    if year_filtered:
+        kept.add("year")
+    # GROUPING() sets a bit for each rolled-up dimension, first dimension most significant
+    grouping_id = sum(1 << (len(CUBE_DIMENSIONS) - 1 - i)
+                      for i, d in enumerate(CUBE_DIMENSIONS) if d not in kept)
+
+    where, args = ["grouping_id = ?"], [grouping_id]
+    for dim, value in filters.items():
+        if isinstance(value, (list, tuple)):
+            where.append(f"{dim} IN ({', '.join('?' * len(value))})")
+            args.extend(value)
+        elif value is not None:
+            where.append(f"{dim} = ?")
+            args.append(value)
+    if year_filtered:
+        where.append("year BETWEEN ? AND ?")
+        args.extend([min_year if min_year is not None else 0, max_year if max_year is not None else 9999])
+
+    measures = measures or list(CUBE_MEASURES)
+    select = by + ["SUM(area) AS area", "SUM(production) AS production"]
+    select += [f"{CUBE_MEASURES[m]} AS {m}" for m in measures]
+    query = f"SELECT {', '.join(select)} FROM yield_cube WHERE {' AND '.join(where)}"
+    if by:
+        query += f" GROUP BY {', '.join(by)}"
+    if order_by is not None:
+        query += f" ORDER BY {order_by} {'DESC' if descending else 'ASC'} NULLS LAST"
+    elif by:
+        query += f" ORDER BY {', '.join(by)}"
+    return get_warehouse().cursor().execute(query, args).fetchdf()
+
+def station_events_report(stations, min_year=None, max_year=None):
+    """Station event counts joined with state rainfall and crop production for the same year"""
+    if not stations:
+        return pd.DataFrame(columns=["station", "state", "year", "events", "annual_mm", "total_prod"])
+    con = get_warehouse().cursor()
+    placeholders = ", ".join("?" for _ in stations)
+    query = f"""
+        SELECT s.station, s.state, s.year, s.events,
+               r.annual_mm, c.total_prod
+        FROM station_events s
+        LEFT JOIN rain r ON r.state = s.state AND r.year = s.year
+        LEFT JOIN crop_state_year c ON c.state = s.state AND c.year = s.year
+        WHERE s.station IN ({placeholders})
+          AND s.year BETWEEN ? AND ?
+        ORDER BY s.station, s.year
     """
-    rainfall_df = con.execute(rainfall_query).fetchdf()
-
-    crops_query = f"""
-        SELECT state, crop, SUM(production) AS total_prod
-        FROM crop
-        WHERE year BETWEEN {min_year} AND {max_year}
-          AND state IN ('{state_x}', '{state_y}')
-        GROUP BY state, crop
-        ORDER BY state, total_prod DESC
+    lo = min_year if min_year is not None else 0
+    hi = max_year if max_year is not None else 9999
+    return con.execute(query, [*stations, lo, hi]).fetchdf()
+
+# ------------------ Core Analytics -------------------
+
+def iter_compare_rainfall_and_crops(state_x, state_y, crop_type=None, years=5, end_year=None, approximate=False):
+    """Yield (stage, payload) pairs: "rainfall", "top_crops", "summary", then "citations".
+
+    With approximate=True the top crops are estimated from stratified samples
+    and carry a "ci95" half-width column instead of being computed exactly.
     """
-    top_crops = con.execute(crops_query).fetchdf().groupby("state").head(3)
+    series = get_time_series()
+    rain_ts, crop_ts = series["rain"], series["crop"]
+
+    # Anchor the window at the requested year, else at the latest rainfall year
+    max_year = int(end_year) if end_year is not None else rain_ts.last_year
+    min_year = max_year - years + 1
+
+    rainfall_df = pd.DataFrame([
+        {"state": s, "avg_rain": rain_ts.window_mean(s, min_year, max_year)}
+        for s in (state_x, state_y)
+        if rain_ts.window_count(s, min_year, max_year)
+    ], columns=["state", "avg_rain"])
+    yield "rainfall", rainfall_df
+
+    if approximate:
+        top_crops = get_approximate_index().top_crops([state_x, state_y], min_year, max_year)
+    else:
+        # Window totals for every (state, crop) series come from one prefix-sum lookup
+        window = crop_ts.window_frame(min_year, max_year)
+        top_crops = (window[window["state"].isin([state_x, state_y]) & (window["count"] > 0)]
+                     .rename(columns={"sum": "total_prod"})[["state", "crop", "total_prod"]]
+                     .sort_values(["state", "total_prod"], ascending=[True, False])
+                     .groupby("state").head(3)
+                     .reset_index(drop=True))
+    yield "top_crops", top_crops
 
     citations = [
         f"{DATASETS['rainfall']['title']} (Source: {DATASETS['rainfall']['source']})",
         f"{DATASETS['crop_production']['title']} (Source: {DATASETS['crop_production']['source']})"
     ]
 
+    def rain_text(state):
+        # Explicit year windows can fall outside the rainfall coverage
+        match = rainfall_df[rainfall_df["state"] == state]["avg_rain"]
+        return f"{match.iloc[0]:.2f} mm" if not match.empty else "n/a"
+
     summary = (
         f"Between {min_year}–{max_year}, average rainfall in {state_x} was "
-        f"{rainfall_df[rainfall_df['state']==state_x]['avg_rain'].iloc[0]:.2f} mm, "
+        f"{rain_text(state_x)}, "
         f"while {state_y} had "
-        f"{rainfall_df[rainfall_df['state']==state_y]['avg_rain'].iloc[0]:.2f} mm.\n\n"
+        f"{rain_text(state_y)}.\n\n"
         f"Top crops produced were:\n{top_crops.to_string(index=False)}"
     )
+    if approximate:
+        summary += "\n\nProduction totals are estimates from stratified samples; ci95 is the 95% margin of error."
+
+    yield "summary", summary
+    yield "citations", citations
+
+def compare_rainfall_and_crops(state_x, state_y, crop_type=None, years=5, end_year=None, approximate=False):
+    parts = dict(iter_compare_rainfall_and_crops(state_x, state_y, crop_type, years, end_year, approximate))
+    return parts["summary"], parts["rainfall"], parts["top_crops"], parts["citations"]
+
+# ------------------ Result Store -------------------
+
+# Answers are kept in a bounded in-memory LRU. Only warmed answers (persist=True,
+# see warmup.py) are also written to disk, under a directory per dataset version,
+# so the disk store is bounded by the warm-up question list and survives restarts
+RESULT_DIR = os.environ.get("SAMARTH_RESULT_CACHE", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "results"))
+RESULT_MEMORY_LIMIT = 256
+
+# Modules whose code shapes an answer; editing any of them retires stored answers
+RESULT_CODE_FILES = ("QAEngine.py", "data_processor.py", "time_series.py", "sketches.py", "questions.py")
+
+def _code_version():
+    """Short fingerprint of the answering code, so a deploy that only changes code does not serve old answers"""
+    import hashlib
+    digest = hashlib.sha1()
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in RESULT_CODE_FILES:
+        try:
+            with open(os.path.join(here, name), "rb") as f:
+                digest.update(f.read())
+        except OSError:
+            digest.update(f"{name}:missing;".encode())
+    return digest.hexdigest()[:12]
+
+RESULT_CODE_VERSION = _code_version()
+
+_results = OrderedDict()
+_results_lock = threading.Lock()
 
-    return summary, rainfall_df, top_crops, citations
+def _result_key(question, approximate):
+    import hashlib
+    normalized = " ".join(question.lower().split())
+    return hashlib.sha1(json.dumps([normalized, approximate]).encode()).hexdigest()
+
+def _result_dir_name(version):
+    return f"{version}-{RESULT_CODE_VERSION}"
+
+def _result_path(version, key):
+    return os.path.join(RESULT_DIR, _result_dir_name(version), f"{key}.pkl")
+
+def get_cached_result(question, approximate=None, version=None):
+    """Return the stored answer parts for a question under the current dataset version, or None"""
+    import pickle
+    version = version or dataset_version()
+    key = (version, _result_key(question, approximate))
+    with _results_lock:
+        if key in _results:
+            _results.move_to_end(key)
+            return _results[key]
+    try:
+        with open(_result_path(*key), "rb") as f:
+            parts = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+    _remember_result(key, parts)
+    return parts
+
+def _remember_result(key, parts):
+    with _results_lock:
+        _results[key] = parts
+        _results.move_to_end(key)
+        while len(_results) > RESULT_MEMORY_LIMIT:
+            _results.popitem(last=False)
+
+def store_result(question, parts, approximate=None, version=None, persist=False):
+    """Keep a question's answer parts ({stage: payload}) tagged with the dataset version; persist=True also saves them to disk"""
+    import pickle
+    version = version or dataset_version()
+    key = (version, _result_key(question, approximate))
+    _remember_result(key, parts)
+    if not persist:
+        return
+    path = _result_path(*key)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(parts, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"Error saving result for {question!r}: {e}")
+
+def prune_result_store(keep_version=None):
+    """Delete stored answers from every dataset or code version except `keep_version` (default: current) with the running code"""
+    import shutil
+    keep_version = keep_version or dataset_version()
+    with _results_lock:
+        for key in [k for k in _results if k[0] != keep_version]:
+            del _results[key]
+    if not os.path.isdir(RESULT_DIR):
+        return
+    for name in os.listdir(RESULT_DIR):
+        if name != _result_dir_name(keep_version):
+            shutil.rmtree(os.path.join(RESULT_DIR, name), ignore_errors=True)
 
 # ------------------ Question Router -------------------
 
+INTENTS = ("compare", "top_crops", "ranking", "trend", "correlation", "lookup", "efficiency", "station")
+
+# Checked in order; the first matching pattern decides the intent
+INTENT_PATTERNS = [
+    ("efficiency", r"\b(fertili[sz]er\w*|pesticide\w*|efficien\w*|per hectare|inputs?|yields?)\b"),
+    ("correlation", r"\b(relate[sd]?|relation\w*|correlat\w*|impact\w*|affect\w*|depend\w*)\b"),
+    ("ranking", r"\bwhich states?\b"),
+    ("top_crops", r"\bwhich crops?\b"),
+    # Not an intent: superlatives rank crops within one named state, otherwise states
+    ("superlative", r"\b(highest|lowest|most|least|rank\w*)\b"),
+    ("trend", r"\b(trend\w*|over time|growth|grow\w*)\b"),
+    ("top_crops", r"\b(top|main|major|leading)\b(\s+\d+)?\s+crops?\b"),
+    ("compare", r"\b(compare\w*|comparison|versus|vs)\b"),
+]
+
+def find_names(names, question_lc):
+    """Names that appear as whole words in the question, in order of appearance.
+
+    Lookarounds rather than \\b, so names ending in a bracket such as "Cotton(lint)"
+    still match while "rice" does not match inside "price".
+    """
+    found = []
+    for name in names:
+        match = re.search(rf"(?<!\w){re.escape(name.lower())}(?!\w)", question_lc)
+        if match:
+            found.append((match.start(), name))
+    return [name for _, name in sorted(found)]
+
+def find_stations(question_lc):
+    """Stations from STATION_STATES named in the question, matched on the name before any bracket"""
+    found = []
+    for station in STATION_STATES:
+        base = station.split("(")[0].strip().lower()
+        match = re.search(rf"\b{re.escape(base)}\b", question_lc)
+        if match:
+            found.append((match.start(), station))
+    return [station for _, station in sorted(found)]
+
+def classify_intent(question_lc, states_found, stations_found=()):
+    # A named weather station outranks the state-level intents
+    if stations_found:
+        return "station"
+    for intent, pattern in INTENT_PATTERNS:
+        if re.search(pattern, question_lc):
+            if intent == "superlative":
+                return "top_crops" if len(states_found) == 1 else "ranking"
+            return intent
+    if len(states_found) == 1:
+        return "lookup"
+    return "compare"
+
 def parse_question(question):
     import re
     question_lc = question.lower()
-    # Get all states and crops from the data for matching
+    # Get all states and crops from the loaded data for matching
     try:
-        all_states = set(pd.read_csv("crop_yield.csv")["State"].str.strip()) | set(pd.read_csv("rainfall_data.csv")["state"].str.strip())
+        vocabulary = get_vocabulary()
+        all_states, all_crops = vocabulary["states"], vocabulary["crops"]
     except Exception:
         all_states = {"Andhra Pradesh", "Gujarat", "Maharashtra", "Karnataka"}
-    try:
-        all_crops = set(pd.read_csv("crop_yield.csv")["Crop"].str.strip())
-    except Exception:
         all_crops = {"Sugarcane", "Cotton(lint)", "Potato", "Soyabean", "Rice"}
-    # Find up to 2 states in the question
-    states_found = [s for s in all_states if s.lower() in question_lc]
-    crops_found = [c for c in all_crops if c.lower() in question_lc]
+    # Find states and crops in the order they appear in the question
+    states_found = find_names(all_states, question_lc)
+    crops_found = find_names(all_crops, question_lc)
     # Extract year(s): any 4-digit number
     year_matches = re.findall(r"(20\d{2}|19\d{2})", question)
     years_found = [int(y) for y in year_matches] if year_matches else []
@@ -172,6 +561,7 @@ def parse_question(question):
     state_y = states_found[1] if len(states_found) > 1 else "Maharashtra"
     crop_type = crops_found[0] if crops_found else None
     # Priority: explicit years -> period -> default
+    max_year = None
     if len(years_found) >= 2:
         # Range like 2018-2022: use as window
         min_year, max_year = min(years_found), max(years_found)
@@ -181,22 +571,424 @@ def parse_question(question):
         n_years = 1
     if n_years is None:
         n_years = 5
+    # Words like "roughly" or "estimate" opt in to the approximate mode
+    approximate = bool(re.search(r"\b(approx\w*|roughly|estimat\w*|ballpark)\b", question_lc))
+    top_n_match = re.search(r"\btop (\d+)\b", question_lc)
+    season_match = re.search(r"\b(kharif|rabi|autumn|summer|winter|whole year)\b", question_lc)
+    # Drill-down dimensions such as "by season" or "per year"
+    group_by = [d for d in CUBE_DIMENSIONS if re.search(rf"\b(by|per|each) {d}s?\b", question_lc)]
+    stations_found = find_stations(question_lc)
     return {
+        "intent": classify_intent(question_lc, states_found, stations_found),
+        "states": states_found,
+        "stations": stations_found,
         "state_x": state_x,
         "state_y": state_y,
         "crop_type": crop_type,
-        "years": n_years
+        "years": n_years,
+        "end_year": max_year,
+        "approximate": approximate,
+        "metric": "rainfall" if re.search(r"\brain(fall|s)?\b", question_lc) else "production",
+        "order": "asc" if re.search(r"\b(lowest|least)\b", question_lc) else "desc",
+        "top_n": int(top_n_match.group(1)) if top_n_match else 3,
+        "season": season_match.group(1).title() if season_match else None,
+        "group_by": group_by,
+        "explicit_years": bool(years_found or n_years_match)
     }
 
-def answer_question(question):
-    params = parse_question(question)
-    ans, rain, crops, cites = compare_rainfall_and_crops(
-        params["state_x"], params["state_y"], params["crop_type"], params["years"]
+# ------------------ Query Planner -------------------
+
+def _citations(*keys):
+    return [f"{DATASETS[k]['title']} (Source: {DATASETS[k]['source']})" for k in keys]
+
+def _window(params, series):
+    """(min_year, max_year) for the question, anchored at the series' latest year by default"""
+    max_year = int(params["end_year"]) if params["end_year"] is not None else series.last_year
+    return max_year - params["years"] + 1, max_year
+
+def _run_compare(params):
+    yield from iter_compare_rainfall_and_crops(
+        params["state_x"], params["state_y"], params["crop_type"], params["years"], params["end_year"],
+        params["approximate"]
     )
-    return ans, rain, crops, cites
+
+def _run_top_crops(params):
+    states = params["states"]
+    crop_ts = get_time_series()["crop"]
+    min_year, max_year = _window(params, crop_ts)
+    ascending = params["order"] == "asc"
+    yield "rainfall", pd.DataFrame()
+    # Samples only bound the large totals, so the smallest crops are always exact
+    if params["approximate"] and states and not ascending:
+        top_crops = get_approximate_index().top_crops(states, min_year, max_year, k=params["top_n"])
+    else:
+        window = crop_ts.window_frame(min_year, max_year)
+        window = window[window["count"] > 0].rename(columns={"sum": "total_prod"})
+        if states:
+            groups = [window[window["state"] == state] for state in states]
+        else:
+            groups = [window.groupby("crop", as_index=False)["total_prod"].sum().assign(state="All states")]
+        pick = pd.DataFrame.nsmallest if ascending else pd.DataFrame.nlargest
+        top_crops = (pd.concat([pick(g, params["top_n"], "total_prod") for g in groups])
+                     [["state", "crop", "total_prod"]]
+                     .reset_index(drop=True))
+    yield "top_crops", top_crops
+    where = ", ".join(states) or "all states"
+    if top_crops.empty:
+        yield "summary", f"No crop production is recorded for {where} between {min_year}–{max_year}."
+    else:
+        n = int(top_crops.groupby("state").size().max())
+        word = "Lowest" if ascending else "Top"
+        yield "summary", (f"{word} {n} crops in {where} between {min_year}–{max_year} by production:\n"
+                          f"{top_crops.to_string(index=False)}")
+    yield "citations", _citations("crop_production")
+
+def _run_ranking(params):
+    series = get_time_series()
+    descending = params["order"] == "desc"
+    word = "highest" if descending else "lowest"
+    if params["metric"] == "rainfall":
+        ts, label, unit = series["rain"], "average rainfall", "mm"
+        min_year, max_year = _window(params, ts)
+        frame = ts.window_frame(min_year, max_year)
+        ranking = (frame[frame["count"] > 0][["state", "mean"]]
+                   .rename(columns={"mean": "avg_rain"})
+                   .sort_values("avg_rain", ascending=not descending)
+                   .reset_index(drop=True))
+        value_col, cites = "avg_rain", _citations("rainfall")
+        yield "rainfall", ranking
+        yield "top_crops", pd.DataFrame()
+    else:
+        crop = params["crop_type"]
+        ts = series["crop"] if crop else series["state_prod"]
+        label, unit = f"{crop} production" if crop else "crop production", "tonnes"
+        min_year, max_year = _window(params, ts)
+        frame = ts.window_frame(min_year, max_year)
+        if crop:
+            frame = frame[frame["crop"] == crop]
+        ranking = (frame[frame["count"] > 0][["state", "sum"]]
+                   .rename(columns={"sum": "total_prod"})
+                   .sort_values("total_prod", ascending=not descending)
+                   .reset_index(drop=True))
+        value_col, cites = "total_prod", _citations("crop_production")
+        yield "rainfall", pd.DataFrame()
+        yield "top_crops", ranking
+    if ranking.empty:
+        yield "summary", f"No {label} is recorded between {min_year}–{max_year}."
+    else:
+        leader = ranking.iloc[0]
+        yield "summary", (f"{leader['state']} had the {word} {label} between {min_year}–{max_year}: "
+                          f"{leader[value_col]:,.2f} {unit}.\n\n{ranking.head(10).to_string(index=False)}")
+    yield "citations", cites
+
+def _run_trend(params):
+    series = get_time_series()
+    state, crop = params["state_x"], params["crop_type"]
+    if params["metric"] == "rainfall":
+        ts, key, label, cites = series["rain"], state, f"Rainfall in {state}", _citations("rainfall")
+    elif crop:
+        ts, key, label, cites = series["crop"], (state, crop), f"{crop} production in {state}", _citations("crop_production")
+    else:
+        ts, key, label, cites = series["state_prod"], state, f"Crop production in {state}", _citations("crop_production")
+    if key not in ts:
+        yield "rainfall", pd.DataFrame()
+        yield "top_crops", pd.DataFrame()
+        yield "summary", f"{label}: no data recorded."
+        yield "citations", cites
+        return
+    min_year, max_year = _window(params, ts)
+    row = ts.key_rows[key]
+    years = list(range(max(min_year, ts.first_year), min(max_year, ts.last_year) + 1))
+    moving = ts.moving_average(key, 3)
+    trend = pd.DataFrame({
+        "year": years,
+        "value": [ts.values[row, y - ts.first_year] for y in years],
+        "moving_avg_3y": [moving[y] for y in years],
+    })
+    if params["metric"] == "rainfall":
+        yield "rainfall", trend
+        yield "top_crops", pd.DataFrame()
+    else:
+        yield "rainfall", pd.DataFrame()
+        yield "top_crops", trend
+    # Measure growth between the first and last years actually recorded in the window
+    observed = trend.dropna(subset=["value"])
+    if len(observed) >= 2:
+        first, last = observed.iloc[0], observed.iloc[-1]
+        growth = ts.growth_rate(key, first["year"], last["year"])
+        change = f"changed by {growth:+.1%} from {int(first['year'])} to {int(last['year'])}"
+    else:
+        change = f"has too few recorded years between {min_year}–{max_year} to measure growth"
+    yield "summary", f"{label} {change}.\n\n{trend.to_string(index=False)}"
+    yield "citations", cites
+
+def _run_correlation(params):
+    con = get_warehouse().cursor()
+    crop, states = params["crop_type"], params["states"]
+    # One pass over the fact table: rainfall and production per (state, year)
+    query = """
+        SELECT state, year, MAX(annual_mm) AS annual_mm, SUM(production) AS production
+        FROM rain_crop_fact
+        WHERE annual_mm IS NOT NULL AND production IS NOT NULL
+    """
+    args = []
+    if crop:
+        query += " AND crop = ?"
+        args.append(crop)
+    if states:
+        query += f" AND state IN ({', '.join('?' for _ in states)})"
+        args.extend(states)
+    query += " GROUP BY state, year ORDER BY state, year"
+    joined = con.execute(query, args).fetchdf()
+    yield "rainfall", joined
+    yield "top_crops", pd.DataFrame()
+    subject = f"{crop} production" if crop else "crop production"
+    if len(joined) < 3:
+        summary = (f"Only {len(joined)} state-year(s) have both rainfall and {subject} recorded, "
+                   f"which is not enough to measure how they relate.")
+    else:
+        r = joined["annual_mm"].corr(joined["production"])
+        summary = (f"Across {len(joined)} state-years, the correlation between annual rainfall and "
+                   f"{subject} is {r:+.2f}.")
+    yield "summary", summary
+    yield "citations", _citations("rainfall", "crop_production")
+
+def _run_lookup(params):
+    state = params["state_x"]
+    rain_ts = get_time_series()["rain"]
+    min_year, max_year = _window(params, rain_ts)
+    con = get_warehouse().cursor()
+    rows = con.execute("""
+        SELECT year, crop, production, annual_mm
+        FROM rain_crop_fact
+        WHERE state = ? AND year BETWEEN ? AND ?
+    """, [state, min_year, max_year]).fetchdf()
+    rainfall_df = (rows.dropna(subset=["annual_mm"])
+                   .drop_duplicates("year")[["year", "annual_mm"]]
+                   .sort_values("year")
+                   .reset_index(drop=True))
+    yield "rainfall", rainfall_df
+    crops = (rows.dropna(subset=["crop", "production"])
+             .groupby("crop", as_index=False)["production"].sum()
+             .rename(columns={"production": "total_prod"})
+             .nlargest(params["top_n"], "total_prod")
+             .reset_index(drop=True))
+    yield "top_crops", crops
+    rain_text = (f"average annual rainfall was {rainfall_df['annual_mm'].mean():.2f} mm"
+                 if not rainfall_df.empty else "no rainfall was recorded")
+    crop_text = (f"top crops by production:\n{crops.to_string(index=False)}"
+                 if not crops.empty else "no crop production was recorded.")
+    yield "summary", f"In {state} between {min_year}–{max_year}, {rain_text}; {crop_text}"
+    yield "citations", _citations("rainfall", "crop_production")
+
+def _efficiency_measures(question_lc):
+    measures = []
+    if re.search(r"fertili[sz]er", question_lc):
+        measures += ["fertilizer_per_ha", "production_per_fertilizer"]
+    if "pesticide" in question_lc:
+        measures.append("pesticide_per_ha")
+    if "yield" in question_lc:
+        measures += ["yield", "production_per_ha"]
+    return measures or list(CUBE_MEASURES)
+
+def _yield_distribution(states, crop):
+    """Approximate yield median and 10th–90th percentiles per state from the t-digests"""
+    approx = get_approximate_index()
+    lines = []
+    for state in states:
+        median, bound = approx.yield_quantile(state, 0.5, crop)
+        if pd.isna(median):
+            continue
+        p10 = approx.yield_quantile(state, 0.1, crop)[0]
+        p90 = approx.yield_quantile(state, 0.9, crop)[0]
+        # The bound is zero when the digest still holds the values around the median individually
+        median_text = f"{median:.2f} (±{bound:.2f})" if bound > 0 else f"{median:.2f} (exact)"
+        lines.append(f"{state}: median {median_text}, 10th–90th percentile {p10:.2f}–{p90:.2f}")
+    return lines
+
+def _run_efficiency(params):
+    states = params["states"]
+    question_lc = params["question"].lower()
+    measures = _efficiency_measures(question_lc)
+    # Without exactly one named state, break out by state so states are not blurred together
+    by = list(params["group_by"])
+    if len(states) != 1 and "state" not in by:
+        by.insert(0, "state")
+    # "Highest"/"lowest" questions rank rows by the first measure asked for
+    ranked = by and re.search(r"\b(highest|lowest|most|least|best|worst)\b", question_lc)
+    if params["explicit_years"]:
+        max_year = params["end_year"] if params["end_year"] is not None else get_time_series()["crop"].last_year
+        min_year = max_year - params["years"] + 1
+        period = f" between {min_year}–{max_year}"
+    else:
+        min_year = max_year = None
+        period = ""
+    cells = query_yield_cube(by=by, state=states or None, crop=params["crop_type"],
+                             season=params["season"], min_year=min_year, max_year=max_year, measures=measures,
+                             order_by=measures[0] if ranked else None, descending=params["order"] == "desc")
+    yield "rainfall", pd.DataFrame()
+    yield "top_crops", cells
+    scope = " ".join(x for x in (params["season"], params["crop_type"]) if x) or "all crops"
+    where = f" in {', '.join(states)}" if states else ""
+    drill = f" by {', '.join(by)}" if by else ""
+    if cells.empty:
+        yield "summary", f"No input or yield data is recorded for {scope}{where}{period}."
+    else:
+        labels = ", ".join(m.replace("_", " ") for m in measures)
+        summary = f"{labels.capitalize()} for {scope}{where}{period}{drill}:\n{cells.to_string(index=False)}"
+        if ranked and pd.notna(cells[measures[0]].iloc[0]):
+            leader = ", ".join(str(cells[d].iloc[0]) for d in by)
+            word = "highest" if params["order"] == "desc" else "lowest"
+            summary = (f"{leader} had the {word} {measures[0].replace('_', ' ')} "
+                       f"({cells[measures[0]].iloc[0]:,.2f}).\n\n{summary}")
+        # Yields of different crops are not comparable, so quantiles need a crop
+        if params["approximate"] and "yield" in measures and params["crop_type"] and states:
+            lines = _yield_distribution(states, params["crop_type"])
+            if lines:
+                summary += (f"\n\nApproximate {params['crop_type']} yield distribution across all recorded "
+                            f"seasons and years (t-digest):\n" + "\n".join(lines))
+        yield "summary", summary
+    yield "citations", _citations("crop_production")
+
+def _run_station(params):
+    stations = params["stations"]
+    if params["explicit_years"]:
+        max_year = params["end_year"] if params["end_year"] is not None else get_time_series()["rain"].last_year
+        min_year = max_year - params["years"] + 1
+        period = f" between {min_year}–{max_year}"
+    else:
+        min_year = max_year = None
+        period = ""
+    report = station_events_report(stations, min_year, max_year)
+    yield "rainfall", report
+    yield "top_crops", pd.DataFrame()
+    if report.empty:
+        yield "summary", f"No events are recorded for {', '.join(stations)}{period}."
+    else:
+        totals = report.groupby("station", sort=False)["events"].sum()
+        counts = ", ".join(f"{station}: {int(n)}" for station, n in totals.items())
+        yield "summary", (f"Recorded events{period} — {counts}. State rainfall and crop production "
+                          f"for the same years are shown alongside.\n\n{report.to_string(index=False)}")
+    yield "citations", _citations("station_events", "rainfall", "crop_production")
+
+# intent -> (executor, steps shown by QueryPlan.explain)
+PLAN_COMPILERS = {
+    "compare": (_run_compare, ["rain series: window mean for 2 states",
+                               "crop series: window sums for (state, crop), top 3 per state"]),
+    "top_crops": (_run_top_crops, ["crop series: window sums for (state, crop), top N per named state or across all states"]),
+    "ranking": (_run_ranking, ["series: window mean/sum for every state", "sort by metric"]),
+    "trend": (_run_trend, ["series: yearly values, 3-year moving average and growth for 1 key"]),
+    "correlation": (_run_correlation, ["rain_crop_fact: scan rows with rainfall, grouped by (state, year)",
+                                       "pearson correlation of rainfall vs production"]),
+    "lookup": (_run_lookup, ["rain_crop_fact: index range scan on (state, year) for 1 state"]),
+    "station": (_run_station, ["station_events: index lookup on (station, year)",
+                               "join rain and crop_state_year on (state, year)"]),
+    "efficiency": (_run_efficiency, ["yield_cube: cells at the grouping level of the filters and drill-down",
+                                     "derive per-hectare and efficiency ratios from summed cells"]),
+}
+
+class QueryPlan:
+    """A parsed question compiled to the single query path its intent needs.
+
+    `explain()` describes the plan before running it; after `execute()` the
+    per-stage wall times are in `timings` (milliseconds), which is the first
+    place to look when a question is slow.
+    """
+
+    def __init__(self, question, params):
+        self.question = question
+        self.params = params
+        self.intent = params["intent"]
+        self.run, self.steps = PLAN_COMPILERS[self.intent]
+        if params["approximate"] and self.intent in ("compare", "top_crops"):
+            self.steps = self.steps + ["top crops estimated from stratified samples (approximate mode)"]
+        elif params["approximate"] and self.intent == "efficiency":
+            self.steps = self.steps + ["yield quantiles merged from per-(state, crop) t-digests (approximate mode)"]
+        self.timings = {}
+
+    def explain(self):
+        return {
+            "question": self.question,
+            "intent": self.intent,
+            "params": self.params,
+            "steps": list(self.steps),
+            "timings_ms": dict(self.timings),
+        }
+
+    def execute(self):
+        """Yield (stage, payload) pairs, recording how long each stage took"""
+        import time
+        started = time.perf_counter()
+        for stage, payload in self.run(self.params):
+            now = time.perf_counter()
+            self.timings[stage] = round((now - started) * 1000, 3)
+            yield stage, payload
+            started = time.perf_counter()
+
+def plan_question(question, approximate=None):
+    """Parse a question and compile it into a QueryPlan"""
+    params = parse_question(question)
+    params["question"] = question
+    if approximate is not None:
+        params["approximate"] = approximate
+    return QueryPlan(question, params)
+
+def answer_question(question, approximate=None, use_cache=True, persist=False, refresh=False):
+    """Answer a question as (summary, rainfall, top_crops, citations).
+
+    use_cache=False always runs the plan and leaves the result store alone,
+    which is what load tests measure. refresh=True also always runs the plan
+    but replaces any stored answer, and persist=True saves a freshly computed
+    answer to disk so it survives restarts (warmup.py passes both).
+    """
+    version = dataset_version()
+    parts = get_cached_result(question, approximate, version) if use_cache and not refresh else None
+    if parts is None:
+        plan = plan_question(question, approximate)
+        parts = {"entities": plan.params, **dict(plan.execute())}
+        if use_cache:
+            store_result(question, parts, approximate, version, persist)
+    return parts["summary"], parts["rainfall"], parts["top_crops"], parts["citations"]
+
+def stream_answer(question, cancel=None, approximate=None, use_cache=True):
+    """Yield (stage, payload) pairs as soon as each part of the answer is ready.
+
+    Stages arrive in order: "entities" (the parsed question), "rainfall",
+    "top_crops", "summary" and "citations". Tables that do not apply to the
+    question's intent are empty DataFrames. If `cancel` (a threading.Event)
+    is set, the stream stops before starting the next stage. Answers already
+    in the result store are replayed without running the plan.
+    """
+    version = dataset_version()
+    cached = get_cached_result(question, approximate, version) if use_cache else None
+    if cached is not None:
+        yield from cached.items()
+        return
+    plan = plan_question(question, approximate)
+    parts = {"entities": plan.params}
+    yield "entities", plan.params
+    stages = plan.execute()
+    try:
+        for stage, payload in stages:
+            if cancel is not None and cancel.is_set():
+                return
+            parts[stage] = payload
+            yield stage, payload
+    finally:
+        stages.close()
+    if use_cache:
+        store_result(question, parts, approximate, version)
+
+def explain_question(question, approximate=None):
+    """Return the query plan for a question without running it"""
+    return plan_question(question, approximate).explain()
 
 class QAEngine:
-    def process_question(self, question):
-        return answer_question(question)
+    def process_question(self, question, approximate=None, use_cache=True, persist=False, refresh=False):
+        return answer_question(question, approximate, use_cache, persist, refresh)
 
+    def stream_question(self, question, cancel=None, approximate=None, use_cache=True):
+        return stream_answer(question, cancel, approximate, use_cache)
 
+    def explain(self, question, approximate=None):
+        return explain_question(question, approximate)
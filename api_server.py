@@ -0,0 +1,78 @@
+# Minimal JSON API over the engine: python api_server.py --port 8000
+# GET /ask?question=...[&approximate=1][&cache=0]  ->  {"summary", "rainfall", "top_crops", "citations"}
+# GET /health                            ->  {"status": "ok", "peak_rss_mb": ...}
+import argparse
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from QAEngine import QAEngine
+
+def frame_records(df):
+    """DataFrame -> list of dicts with NaN turned into null"""
+    return json.loads(df.to_json(orient="records")) if df is not None else []
+
+class QAHandler(BaseHTTPRequestHandler):
+    engine = QAEngine()
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path == "/health":
+            # Lets load_test.py report the server's memory rather than its own
+            from load_test import peak_rss_mb
+            self._send(200, {"status": "ok", "peak_rss_mb": round(peak_rss_mb(), 1)})
+            return
+        if url.path != "/ask":
+            self._send(404, {"error": f"Unknown path {url.path}"})
+            return
+        question = query.get("question", [""])[0].strip()
+        if not question:
+            self._send(400, {"error": "Missing 'question' parameter."})
+            return
+        approximate = query.get("approximate", [None])[0]
+        if approximate is not None:
+            approximate = approximate.lower() in ("1", "true", "yes")
+        use_cache = query.get("cache", ["1"])[0].lower() not in ("0", "false", "no")
+        try:
+            summary, rainfall, top_crops, citations = self.engine.process_question(question, approximate, use_cache)
+        except Exception as e:
+            self._send(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+        self._send(200, {
+            "summary": summary,
+            "rainfall": frame_records(rainfall),
+            "top_crops": frame_records(top_crops),
+            "citations": citations,
+        })
+
+    def log_message(self, *args):
+        pass
+
+def make_server(host="127.0.0.1", port=8000):
+    return ThreadingHTTPServer((host, port), QAHandler)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve QAEngine answers as JSON over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args(argv)
+    server = make_server(args.host, args.port)
+    print(f"Serving QAEngine on http://{args.host}:{server.server_port}/ask")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 import streamlit as st
-from QAEngine import QAEngine
+from QAEngine import QAEngine, SUGGESTED_QUESTIONS
 from PIL import Image
 import base64
 
@@ -10,14 +10,44 @@ def render_logo():
     </div>
     """, unsafe_allow_html=True)
 
+def render_answer_stream(stream):
+    """Draw each stage of the answer as soon as the engine yields it"""
+    entities_slot = st.empty()
+    answer_slot = st.empty()
+    rainfall_slot = st.empty()
+    crops_slot = st.empty()
+    answer_slot.markdown('<div class="answer-box">Working on your answer…</div>', unsafe_allow_html=True)
+    try:
+        for stage, payload in stream:
+            if stage == "entities":
+                if payload["intent"] == "compare":
+                    # Compare falls back to default states when fewer than two are named
+                    places = f"{payload['state_x']} vs {payload['state_y']}"
+                else:
+                    places = ", ".join(payload.get("stations") or payload["states"]) or "all states"
+                period = f"{payload['years']} year(s)" + (f" up to {payload['end_year']}" if payload.get("end_year") else "")
+                crop = f" · crop: {payload['crop_type']}" if payload.get("crop_type") else ""
+                intent = payload["intent"].replace("_", " ")
+                entities_slot.markdown(f"<b>Looking at:</b> {intent} · {places} · {period}{crop}", unsafe_allow_html=True)
+            elif stage in ("rainfall", "top_crops") and payload.empty:
+                # The question's intent did not need this table
+                continue
+            elif stage == "rainfall":
+                with rainfall_slot.container():
+                    st.markdown("<b>Rainfall Table:</b>", unsafe_allow_html=True)
+                    st.dataframe(payload, use_container_width=True, height=340)
+            elif stage == "top_crops":
+                with crops_slot.container():
+                    st.markdown("<b>Crop Production Table:</b>", unsafe_allow_html=True)
+                    st.dataframe(payload, use_container_width=True, height=340)
+            elif stage == "summary":
+                answer_slot.markdown('<div class="answer-box">' + str(payload).replace('\n','<br>') + '</div>', unsafe_allow_html=True)
+    finally:
+        # Streamlit stops this run when the user submits again; release the engine's work too
+        stream.close()
+
 def get_suggestion_list():
-    return [
-        "Compare average rainfall between Gujarat and Maharashtra in 2022.",
-        "What were the top crops in Karnataka last 3 years?",
-        "Which state had the highest rainfall recently?",
-        "Show rainfall and crop info for Andhra Pradesh in 2021.",
-        "How does rainfall trend relate to rice production?"
-    ]
+    return list(SUGGESTED_QUESTIONS)
 
 def main():
     st.set_page_config(page_title="Project Samarth - Agri Insights", page_icon="🌱", layout="wide")
@@ -121,17 +151,9 @@ def main():
     if ask or st.session_state['trigger_answer']:
         st.session_state['trigger_answer'] = False
         if st.session_state['question'].strip():
+            # Resubmitting makes Streamlit stop this run; render_answer_stream then closes the stream
             qa_engine = QAEngine()
-            result = qa_engine.process_question(st.session_state['question'])
-            answer = result[0] if isinstance(result, (list, tuple)) else result
-            st.markdown('<div class="answer-box">' + str(answer).replace('\n','<br>') + '</div>', unsafe_allow_html=True)
-            if isinstance(result, (list, tuple)) and len(result) > 1:
-                if hasattr(result[1], 'head'):
-                    st.markdown("<b>Rainfall Table:</b>", unsafe_allow_html=True)
-                    st.dataframe(result[1], use_container_width=True, height=340)
-                if len(result) > 2 and hasattr(result[2], 'head'):
-                    st.markdown("<b>Top Crops Table:</b>", unsafe_allow_html=True)
-                    st.dataframe(result[2], use_container_width=True, height=340)
+            render_answer_stream(qa_engine.stream_question(st.session_state['question']))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -3,9 +3,8 @@ import requests
 import pandas as pd
 import duckdb
 import json
-from requests.adapters import HTTPAdapter
-from requests.packages.urllib3.util.retry import Retry
 import time
+from http_cache import get_client
 
 API_KEY = "579b464db66ec23bdd000001cdd3946e44ce4aad7209ff7b23ac571b"
 
@@ -13,26 +12,12 @@ API_KEY = "579b464db66ec23bdd000001cdd3946e44ce4aad7209ff7b23ac571b"
 RAINFALL_RESOURCE_ID = "9ef84268-d588-465a-a308-a864a43d0070"  # Example resource ID
 CROP_RESOURCE_ID = "6d25a34f-7874-4501-87ea-913d7b6021c4"      # Example resource ID
 
-def create_robust_session():
-    """Create a session with retry strategy"""
-    session = requests.Session()
-    retry_strategy = Retry(
-        total=3,
-        backoff_factor=1,
-        status_forcelist=[429, 500, 502, 503, 504]
-    )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session.mount("https://", adapter)
-    session.mount("http://", adapter)
-    return session
-
 def fetch_resource(resource_id, api_key, limit=1000):
     """Fetch data with improved error handling and retry logic"""
-    session = create_robust_session()
+    client = get_client()
     
     try:
         # First try the newer API endpoint
-        url = f"https://api.data.gov.in/resource/{resource_id}"
         params = {
             "api-key": api_key,
             "format": "json",
@@ -40,11 +25,8 @@ def fetch_resource(resource_id, api_key, limit=1000):
             "offset": 0
         }
         
-        print(f"Fetching data from {url}")
-        r = session.get(url, params=params, timeout=60)
-        r.raise_for_status()
-        
-        data = r.json()
+        print(f"Fetching data from {client.base_url}/{resource_id}")
+        data = client.get_json(resource_id, params, timeout=60)
         records = data.get("records", [])
         
         if not records and "result" in data:
@@ -2,10 +2,11 @@ import requests
 import pandas as pd
 import json
 from typing import Dict, Any, Optional
+from http_cache import CachedHTTPClient, get_client
 
 class DataGovCollector:
-    def __init__(self):
-        self.base_url = "https://api.data.gov.in/resource"
+    def __init__(self, client: Optional[CachedHTTPClient] = None):
+        self.client = client or get_client()
         self.api_key = "579b464db66ec23bdd000001cdd3946e44ce4aad7209ff7b23ac571b"
         
     def fetch_agriculture_data(self) -> Optional[Dict[str, Any]]:
@@ -19,10 +20,7 @@ class DataGovCollector:
                 "offset": 0,
                 "limit": 100
             }
-            url = f"{self.base_url}/{resource_id}"
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
+            return self.client.get_json(resource_id, params)
         except requests.exceptions.RequestException as e:
             print(f"Error fetching agriculture data: {e}")
             return None
@@ -38,10 +36,7 @@ class DataGovCollector:
                 "offset": 0,
                 "limit": 100
             }
-            url = f"{self.base_url}/{resource_id}"
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
+            return self.client.get_json(resource_id, params)
         except requests.exceptions.RequestException as e:
             print(f"Error fetching climate data: {e}")
             return None
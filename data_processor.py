@@ -1,18 +1,108 @@
 import pandas as pd
 
+def normalize_rainfall(df):
+    """Convert monthly rainfall columns to annual"""
+    df = df.rename(columns=str.lower)
+    month_cols = [c for c in df.columns if any(m in c for m in [
+        "jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"
+    ])]
+    if month_cols:
+        for c in month_cols:
+            df[c] = pd.to_numeric(df[c], errors="coerce")
+        df["annual_mm"] = df[month_cols].sum(axis=1)
+    if "state" not in df.columns:
+        if "subdivision" in df.columns:
+            df["state"] = df["subdivision"]
+    df["year"] = pd.to_numeric(df["year"] if "year" in df.columns else df["yr"], errors="coerce")
+    return df[["state", "year", "annual_mm"]].dropna()
+
+def normalize_crop(df):
+    """Standardize crop production data, accepting crop_yield.csv structure"""
+    df = df.rename(columns=str.lower)
+    # Use crop_year as year if year is missing
+    if "year" not in df.columns and "crop_year" in df.columns:
+        df["year"] = df["crop_year"]
+    required_cols = ["state", "crop", "year", "production"]
+    # Early exit if DataFrame is empty
+    if df.empty:
+        raise KeyError("Crop data file returned no records. Please check the CSV file and its path.")
+    col_map = {
+        "state": ["state", "subdivision"],
+        "crop": ["crop", "commodity"],
+        "year": ["year", "crop_year", "yr"],
+        "production": ["production", "production_tonnes", "prod_tonnes", "modal_price", "max_price"]
+    }
+    for key, alternatives in col_map.items():
+        for alt in alternatives:
+            if alt in df.columns:
+                df[key] = df[alt]
+                break
+    # If district exists, include it as a column
+    if "district" in df.columns:
+        required_cols.insert(1, "district")
+    missing = [c for c in required_cols if c not in df.columns]
+    if missing:
+        raise KeyError(f"Missing columns in crop data: {missing}. Available columns: {df.columns.tolist()}")
+    df["production"] = pd.to_numeric(df["production"], errors="coerce")
+    df["year"] = pd.to_numeric(df["year"], errors="coerce")
+    return df[required_cols].dropna()
+
 class DataProcessor:
     def __init__(self):
         self.agriculture_data = None
         self.climate_data = None
-    
+        self.merged_data = None
+
     def standardize_agriculture_data(self, raw_data):
-        # Implementation for standardizing agriculture data
-        pass
-    
+        """Normalize raw crop records, keeping season, the area/input/yield columns and the sheet's annual rainfall"""
+        data = normalize_crop(raw_data)
+        raw = raw_data.rename(columns=str.lower)
+        for col in ("area", "fertilizer", "pesticide", "yield", "annual_rainfall"):
+            if col in raw.columns:
+                data[col] = pd.to_numeric(raw.loc[data.index, col], errors="coerce")
+            else:
+                data[col] = float("nan")
+        if "season" in raw.columns:
+            data["season"] = raw.loc[data.index, "season"].astype(str).str.strip()
+        else:
+            data["season"] = "Unspecified"
+        data["crop"] = data["crop"].astype(str).str.strip()
+        data["state"] = data["state"].astype(str).str.strip()
+        data["year"] = data["year"].astype(int)
+        self.agriculture_data = data.reset_index(drop=True)
+        return self.agriculture_data
+
     def standardize_climate_data(self, raw_data):
-        # Implementation for standardizing climate data
-        pass
-    
+        """Normalize raw rainfall records to one annual total per (state, year)"""
+        data = normalize_rainfall(raw_data)
+        data["state"] = data["state"].astype(str).str.strip()
+        data["year"] = data["year"].astype(int)
+        # Average duplicate subdivision rows so each (state, year) appears once
+        self.climate_data = data.groupby(["state", "year"], as_index=False)["annual_mm"].mean()
+        return self.climate_data
+
     def merge_datasets(self):
-        # Implementation for merging agriculture and climate data
-        pass
\ No newline at end of file
+        """Join crop and rainfall data into one fact table keyed on (state, year, crop).
+
+        Crop rows are rolled up across seasons and districts, yield is recomputed
+        as production per unit area, and annual rainfall for the same (state, year)
+        sits on every row. Rainfall comes from the climate data, falling back to
+        the crop sheet's own annual rainfall for state-years the climate data does
+        not cover. State-years that only have rainfall keep a single row with an
+        empty crop, so the table answers rainfall and crop questions alike.
+        """
+        if self.agriculture_data is None or self.climate_data is None:
+            raise ValueError("Standardize agriculture and climate data before merging.")
+        crop = (self.agriculture_data
+                .groupby(["state", "year", "crop"], as_index=False)[["production", "area"]]
+                .sum(min_count=1))
+        crop["yield"] = crop["production"] / crop["area"].where(crop["area"] > 0)
+        sheet_rain = (self.agriculture_data
+                      .groupby(["state", "year"], as_index=False)["annual_rainfall"].mean()
+                      .dropna())
+        rain = self.climate_data.merge(sheet_rain, on=["state", "year"], how="outer")
+        rain["annual_mm"] = rain["annual_mm"].fillna(rain["annual_rainfall"])
+        merged = crop.merge(rain[["state", "year", "annual_mm"]], on=["state", "year"], how="outer")
+        merged = merged[["state", "year", "crop", "production", "area", "yield", "annual_mm"]]
+        self.merged_data = merged.sort_values(["state", "year", "crop"], na_position="first").reset_index(drop=True)
+        return self.merged_data
@@ -0,0 +1,217 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+API_BASE_URL = os.environ.get("DATA_GOV_API_URL", "https://api.data.gov.in/resource")
+CACHE_DIR = os.environ.get("SAMARTH_HTTP_CACHE", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "http"))
+
+# Query parameters that identify the caller rather than the data; left out of cache keys
+UNKEYED_PARAMS = {"api-key"}
+
+class OfflineCacheMiss(requests.exceptions.RequestException):
+    """Raised in offline mode when a request has no cached response"""
+
+def create_robust_session():
+    """Create a session with retry strategy"""
+    session = requests.Session()
+    retry_strategy = Retry(
+        total=3,
+        backoff_factor=1,
+        status_forcelist=[429, 500, 502, 503, 504]
+    )
+    adapter = HTTPAdapter(max_retries=retry_strategy)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+class CachedHTTPClient:
+    """data.gov.in client backed by an on-disk, gzip-compressed response cache.
+
+    Each request is keyed by resource ID plus its query parameters and points
+    at a body blob named by the SHA-256 of its content, so identical responses
+    are stored once. Fresh entries are served from disk; stale ones are
+    revalidated with ETag / Last-Modified. The blob store is bounded by
+    `max_bytes`, evicting least recently used entries first. In offline mode
+    only cached responses are served.
+    """
+
+    def __init__(self, cache_dir=None, base_url=None, max_bytes=256 * 1024 * 1024,
+                 max_age=24 * 3600, offline=None, session=None):
+        self.cache_dir = cache_dir or CACHE_DIR
+        self.base_url = (base_url or API_BASE_URL).rstrip("/")
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        if offline is None:
+            offline = os.environ.get("SAMARTH_OFFLINE", "").lower() in ("1", "true", "yes")
+        self.offline = offline
+        self.session = session or create_robust_session()
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(self.cache_dir, "entries"), exist_ok=True)
+        os.makedirs(os.path.join(self.cache_dir, "blobs"), exist_ok=True)
+
+    # ------------------ Cache layout -------------------
+
+    @staticmethod
+    def cache_key(resource_id, params):
+        keyed = {k: str(v) for k, v in (params or {}).items() if k not in UNKEYED_PARAMS}
+        raw = json.dumps({"resource": resource_id, "params": keyed}, sort_keys=True)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, "entries", f"{key}.json")
+
+    def _blob_path(self, digest):
+        return os.path.join(self.cache_dir, "blobs", digest[:2], f"{digest}.gz")
+
+    @staticmethod
+    def _write_atomic(path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _load_entry(self, key):
+        try:
+            with open(self._entry_path(key)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if os.path.exists(self._blob_path(entry["digest"])) else None
+
+    def _save_entry(self, key, entry):
+        self._write_atomic(self._entry_path(key), json.dumps(entry).encode())
+
+    def _read_body(self, entry):
+        with gzip.open(self._blob_path(entry["digest"]), "rb") as f:
+            return f.read()
+
+    def _read_cached(self, entry):
+        """Body for a cache entry, or None if another thread evicted its blob since the entry was read"""
+        try:
+            return self._read_body(entry)
+        except FileNotFoundError:
+            return None
+
+    def _store(self, key, resource_id, params, response):
+        body = response.content
+        digest = hashlib.sha256(body).hexdigest()
+        blob_path = self._blob_path(digest)
+        if not os.path.exists(blob_path):
+            self._write_atomic(blob_path, gzip.compress(body))
+        now = time.time()
+        entry = {
+            "resource_id": resource_id,
+            "params": {k: str(v) for k, v in (params or {}).items() if k not in UNKEYED_PARAMS},
+            "digest": digest,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "stored_at": now,
+            "last_access": now,
+        }
+        self._save_entry(key, entry)
+        return body
+
+    # ------------------ Requests -------------------
+
+    def get_json(self, resource_id, params=None, timeout=60):
+        """Return the parsed JSON for a resource, from cache when possible"""
+        return json.loads(self.get_bytes(resource_id, params, timeout))
+
+    def get_bytes(self, resource_id, params=None, timeout=60):
+        key = self.cache_key(resource_id, params)
+        entry = self._load_entry(key)
+        now = time.time()
+
+        if entry and (self.offline or now - entry["stored_at"] < self.max_age):
+            body = self._read_cached(entry)
+            if body is not None:
+                entry["last_access"] = now
+                self._save_entry(key, entry)
+                return body
+            entry = None
+        if self.offline:
+            raise OfflineCacheMiss(f"No cached response for resource {resource_id} (offline mode)")
+
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        url = f"{self.base_url}/{resource_id}"
+        try:
+            response = self.session.get(url, params=params, headers=headers, timeout=timeout)
+            if response.status_code == 304 and entry:
+                body = self._read_cached(entry)
+                if body is not None:
+                    entry["stored_at"] = entry["last_access"] = now
+                    self._save_entry(key, entry)
+                    return body
+                # The blob was evicted after revalidation started; fetch the full body
+                response = self.session.get(url, params=params, timeout=timeout)
+            response.raise_for_status()
+        except requests.exceptions.RequestException:
+            # Serve a stale copy rather than fail when the API is unreachable
+            body = self._read_cached(entry) if entry else None
+            if body is not None:
+                return body
+            raise
+
+        with self._lock:
+            body = self._store(key, resource_id, params, response)
+            self.evict()
+        return body
+
+    # ------------------ Eviction -------------------
+
+    def evict(self):
+        """Drop least recently used entries until the blob store fits in max_bytes"""
+        entries_dir = os.path.join(self.cache_dir, "entries")
+        entries = []
+        for name in os.listdir(entries_dir):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(entries_dir, name)) as f:
+                    entries.append((name, json.load(f)))
+            except (OSError, ValueError):
+                continue
+        sizes, refs = {}, {}
+        for _, entry in entries:
+            digest = entry["digest"]
+            refs[digest] = refs.get(digest, 0) + 1
+            path = self._blob_path(digest)
+            if digest not in sizes and os.path.exists(path):
+                sizes[digest] = os.path.getsize(path)
+
+        total = sum(sizes.values())
+        for name, entry in sorted(entries, key=lambda e: e[1].get("last_access", 0)):
+            if total <= self.max_bytes:
+                break
+            digest = entry["digest"]
+            try:
+                os.remove(os.path.join(entries_dir, name))
+                refs[digest] -= 1
+                # A blob is only removed once no remaining entry points at it
+                if refs[digest] == 0 and digest in sizes:
+                    total -= sizes.pop(digest)
+                    os.remove(self._blob_path(digest))
+            except FileNotFoundError:
+                continue
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    """Shared cached client used by the engine, collector and scripts"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = CachedHTTPClient()
+        return _client
@@ -0,0 +1,202 @@
+# Load-test harness: python load_test.py --concurrency 8 --requests 200 --scale 10
+import argparse
+import contextlib
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from questions import load_questions
+
+def make_scaled_dataset(scale, seed=0, out_dir=None):
+    """Write a synthetic copy of the local CSVs with the crop data repeated `scale` times.
+
+    Each extra copy jitters area and production by up to +/-10%, so queries
+    touch `scale`x as many rows while answers keep the same shape. Rainfall
+    and station files are copied as-is. Returns the directory path.
+    """
+    import numpy as np
+    import pandas as pd
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    out_dir = out_dir or tempfile.mkdtemp(prefix=f"samarth_x{scale}_")
+    os.makedirs(out_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+
+    crop = pd.read_csv(os.path.join(src_dir, "crop_yield.csv"))
+    copies = [crop]
+    for _ in range(int(scale) - 1):
+        copy = crop.copy()
+        for col in ("Area", "Production", "Fertilizer", "Pesticide"):
+            copy[col] = copy[col] * rng.uniform(0.9, 1.1, len(copy))
+        copy["Yield"] = copy["Production"] / copy["Area"]
+        copies.append(copy)
+    pd.concat(copies, ignore_index=True).to_csv(os.path.join(out_dir, "crop_yield.csv"), index=False)
+
+    with open(os.path.join(src_dir, "datasets_info.json")) as f:
+        station_file = json.load(f)["station_events"]["file"]
+    for name in ("rainfall_data.csv", station_file):
+        with open(os.path.join(src_dir, name), "rb") as src, open(os.path.join(out_dir, name), "wb") as dst:
+            dst.write(src.read())
+    return out_dir
+
+def engine_target():
+    """Call the engine in-process, bypassing the result store so every request runs its plan"""
+    from QAEngine import QAEngine
+    engine = QAEngine()
+    return lambda question: engine.process_question(question, use_cache=False)
+
+def http_target(url, timeout=60):
+    """GET `url` (api_server.py's /ask endpoint) with the question as a query parameter, bypassing the result store"""
+    import requests
+    local = threading.local()
+
+    def call(question):
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        response = local.session.get(url, params={"question": question, "cache": 0}, timeout=timeout)
+        response.raise_for_status()
+        return response.content
+    return call
+
+def server_peak_rss_mb(url, timeout=10):
+    """Peak RSS reported by api_server.py's /health endpoint next to `url`, or None if unavailable"""
+    import requests
+    from urllib.parse import urlparse
+    health = urlparse(url)._replace(path="/health", query="").geturl()
+    try:
+        return requests.get(health, timeout=timeout).json().get("peak_rss_mb")
+    except (requests.exceptions.RequestException, ValueError):
+        return None
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    rank = (len(sorted_values) - 1) * pct / 100.0
+    lo = int(rank)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (rank - lo)
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def run_load(call, questions, n_requests=100, concurrency=4, rate=None, seed=0, warmup=1):
+    """Replay a seeded question mix and return latency/throughput statistics.
+
+    With `rate` (requests/second) arrivals follow a Poisson process, so
+    latency includes queueing when the engine falls behind; without it each
+    worker sends its next request as soon as the previous one returns.
+    """
+    rng = random.Random(seed)
+    schedule = [rng.choice(questions) for _ in range(n_requests)]
+    latencies, errors, warmup_errors = [], [], []
+    for question in questions[:warmup]:
+        # A failing warm-up question is reported, not fatal; if it is in the
+        # schedule it fails again there and counts toward error_rate
+        try:
+            call(question)
+        except Exception as e:
+            warmup_errors.append({"question": question, "error": f"{type(e).__name__}: {e}"})
+
+    lock = threading.Lock()
+
+    def one(question, scheduled_at):
+        start = scheduled_at if scheduled_at is not None else time.perf_counter()
+        try:
+            call(question)
+            ok = True
+        except Exception as e:
+            ok = False
+            error = f"{type(e).__name__}: {e}"
+        elapsed = time.perf_counter() - start
+        with lock:
+            if ok:
+                latencies.append(elapsed)
+            else:
+                errors.append({"question": question, "error": error})
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        if rate:
+            next_at = started
+            for question in schedule:
+                next_at += rng.expovariate(rate)
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(one, question, next_at)
+        else:
+            for question in schedule:
+                pool.submit(one, question, None)
+    wall = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    ms = lambda v: round(v * 1000, 2) if v is not None else None
+    return {
+        "requests": n_requests,
+        "concurrency": concurrency,
+        "arrival_rate": rate,
+        "seed": seed,
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(len(latencies) / wall, 2) if wall > 0 else None,
+        "error_rate": round(len(errors) / n_requests, 4) if n_requests else 0.0,
+        "latency_ms": {
+            "p50": ms(percentile(ordered, 50)),
+            "p95": ms(percentile(ordered, 95)),
+            "p99": ms(percentile(ordered, 99)),
+            "mean": ms(sum(ordered) / len(ordered)) if ordered else None,
+            "max": ms(ordered[-1]) if ordered else None,
+        },
+        "errors": errors[:20],
+        "warmup_errors": warmup_errors,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a question mix against QAEngine and report latency percentiles as JSON.")
+    parser.add_argument("--target", choices=["engine", "http"], default="engine")
+    parser.add_argument("--url", default="http://localhost:8000/ask", help="api_server.py /ask URL (with --target http)")
+    parser.add_argument("--corpus", help="JSONL file of {\"question\": ..., \"weight\": n} lines")
+    parser.add_argument("--no-suggestions", action="store_true", help="Replay only the corpus questions")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rate", type=float, help="Open-loop arrival rate in requests/second")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scale", type=int, default=1, help="Run the engine on a synthetic dataset this many times larger")
+    parser.add_argument("--data-dir", help="Write the --scale dataset here and keep it (default: a temporary directory removed after the run)")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+    if args.scale > 1 and args.target == "http":
+        parser.error("--scale only applies to --target engine; for HTTP runs start api_server.py "
+                     "with SAMARTH_DATA_DIR pointing at a scaled copy of the data")
+
+    with contextlib.ExitStack() as stack:
+        if args.scale > 1:
+            out_dir = args.data_dir or stack.enter_context(
+                tempfile.TemporaryDirectory(prefix=f"samarth_x{args.scale}_"))
+            # Must be set before QAEngine is imported, which fixes its data directory
+            os.environ["SAMARTH_DATA_DIR"] = make_scaled_dataset(args.scale, args.seed, out_dir)
+
+        questions = load_questions(args.corpus, include_suggestions=not args.no_suggestions)
+        call = engine_target() if args.target == "engine" else http_target(args.url)
+        report = run_load(call, questions, args.requests, args.concurrency, args.rate, args.seed)
+    # Memory of the process answering the questions: this one, or the API server
+    rss = round(peak_rss_mb(), 1) if args.target == "engine" else server_peak_rss_mb(args.url)
+    report.update({"target": args.target, "scale": args.scale, "questions": len(set(questions)),
+                   "peak_rss_mb": rss})
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+import json
+
+# Example questions offered on the landing page
+SUGGESTED_QUESTIONS = [
+    "Compare average rainfall between Gujarat and Maharashtra in 2022.",
+    "What were the top crops in Karnataka last 3 years?",
+    "Which state had the highest rainfall recently?",
+    "Show rainfall and crop info for Andhra Pradesh in 2021.",
+    "How does rainfall trend relate to rice production?"
+]
+
+def load_questions(corpus=None, include_suggestions=True):
+    """Suggestion-list questions plus any {"question": ..., "weight": n} lines from a JSONL corpus"""
+    questions = []
+    if include_suggestions:
+        questions.extend(SUGGESTED_QUESTIONS)
+    if corpus:
+        with open(corpus) as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    record = json.loads(line)
+                    questions.extend([record["question"]] * int(record.get("weight", 1)))
+    if not questions:
+        raise ValueError("No questions to replay. Provide a corpus or keep the suggestion list.")
+    return questions
@@ -0,0 +1,148 @@
+import math
+import numpy as np
+import pandas as pd
+
+class TDigest:
+    """Merging t-digest for streaming quantiles; `compression` bounds the number of centroids"""
+
+    def __init__(self, compression=100):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+
+    @property
+    def count(self):
+        return float(self.weights.sum())
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if values.size:
+            self._compress(np.concatenate([self.means, values]),
+                           np.concatenate([self.weights, np.ones(values.size)]))
+        return self
+
+    def merge(self, other):
+        if other.means.size:
+            self._compress(np.concatenate([self.means, other.means]),
+                           np.concatenate([self.weights, other.weights]))
+        return self
+
+    def _scale(self, q):
+        return self.compression / (2 * math.pi) * math.asin(2 * min(max(q, 0.0), 1.0) - 1)
+
+    def _compress(self, means, weights):
+        order = np.argsort(means, kind="mergesort")
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+        out_means, out_weights = [means[0]], [weights[0]]
+        seen = 0.0
+        k_lower = self._scale(0.0)
+        for mean, weight in zip(means[1:], weights[1:]):
+            # Merge into the current centroid while it stays within one unit of the scale function
+            if self._scale((seen + out_weights[-1] + weight) / total) - k_lower <= 1:
+                new_weight = out_weights[-1] + weight
+                out_means[-1] += (mean - out_means[-1]) * weight / new_weight
+                out_weights[-1] = new_weight
+            else:
+                seen += out_weights[-1]
+                k_lower = self._scale(seen / total)
+                out_means.append(mean)
+                out_weights.append(weight)
+        self.means = np.asarray(out_means)
+        self.weights = np.asarray(out_weights)
+
+    def quantile(self, q):
+        if not self.means.size:
+            return float("nan")
+        if self.means.size == 1:
+            return float(self.means[0])
+        # Centroid means sit at the midpoint of their cumulative rank
+        centers = (np.cumsum(self.weights) - self.weights / 2) / self.count
+        return float(np.interp(q, centers, self.means))
+
+    def quantile_bound(self, q):
+        """Largest possible gap between quantile(q) and the exact q-quantile.
+
+        Each centroid holds a contiguous run of the sorted values, so the value
+        at rank q lies between the means of the neighbours of the centroid that
+        holds that rank. Zero when that centroid and its neighbours are single values.
+        """
+        if not self.means.size:
+            return float("nan")
+        cumulative = np.cumsum(self.weights)
+        i = min(int(np.searchsorted(cumulative, q * self.count)), self.means.size - 1)
+        lo, hi = max(i - 1, 0), min(i + 1, self.means.size - 1)
+        if self.weights[lo:hi + 1].max() <= 1:
+            return 0.0
+        estimate = self.quantile(q)
+        return float(max(self.means[hi] - estimate, estimate - self.means[lo]))
+
+class ApproximateIndex:
+    """Per-(state, crop) stratified samples and sketches built once at ingest.
+
+    Each stratum keeps a seeded random sample of at most `sample_size` rows,
+    which gives window production totals with a 95% confidence half-width,
+    and a t-digest of every row's yield for quantiles. Digests are mergeable,
+    so state-level quantiles combine strata without touching raw rows.
+    """
+
+    Z_95 = 1.96
+
+    def __init__(self, crop_df, sample_size=64, compression=100, seed=0):
+        self.sample_size = sample_size
+        self.strata = {}
+        self.state_crops = {}
+        for (state, crop), group in crop_df.groupby(["state", "crop"], sort=False):
+            n = min(sample_size, len(group))
+            sample = group.sample(n=n, random_state=seed) if n < len(group) else group
+            self.strata[(state, crop)] = {
+                "population": len(group),
+                "years": sample["year"].to_numpy(dtype=int),
+                "production": sample["production"].to_numpy(dtype=float),
+                "yield": TDigest(compression).update(group["yield"].to_numpy(dtype=float))
+                         if "yield" in group.columns else TDigest(compression),
+            }
+            self.state_crops.setdefault(state, []).append(crop)
+
+    def estimate_total(self, state, crop, start_year, end_year):
+        """Estimated production over [start_year, end_year] and its 95% half-width"""
+        stratum = self.strata.get((state, crop))
+        if stratum is None:
+            return 0.0, 0.0
+        population, n = stratum["population"], len(stratum["production"])
+        in_window = (stratum["years"] >= start_year) & (stratum["years"] <= end_year)
+        values = np.where(in_window, stratum["production"], 0.0)
+        estimate = population / n * values.sum()
+        if n >= population or n < 2:
+            return float(estimate), 0.0
+        variance = population ** 2 * (1 - n / population) * values.var(ddof=1) / n
+        return float(estimate), float(self.Z_95 * math.sqrt(variance))
+
+    def top_crops(self, states, start_year, end_year, k=3):
+        """Top-k crops per state by estimated window production, with 95% half-widths"""
+        rows = []
+        for state in states:
+            for crop in self.state_crops.get(state, []):
+                estimate, half_width = self.estimate_total(state, crop, start_year, end_year)
+                if estimate > 0:
+                    rows.append({"state": state, "crop": crop, "total_prod": estimate, "ci95": half_width})
+        frame = pd.DataFrame(rows, columns=["state", "crop", "total_prod", "ci95"])
+        return (frame.sort_values(["state", "total_prod"], ascending=[True, False])
+                .groupby("state").head(k)
+                .reset_index(drop=True))
+
+    def yield_quantile(self, state, q, crop=None):
+        """Yield quantile for one crop or, merged across crops, for the whole state.
+
+        Returns (value, bound) where bound is TDigest.quantile_bound: the most
+        the value can differ from the exact quantile (0 when it is exact).
+        """
+        crops = [crop] if crop is not None else self.state_crops.get(state, [])
+        digests = [self.strata[(state, c)]["yield"] for c in crops if (state, c) in self.strata]
+        if not digests:
+            return float("nan"), float("nan")
+        merged = TDigest(digests[0].compression)
+        for digest in digests:
+            merged.merge(digest)
+        return merged.quantile(q), merged.quantile_bound(q)
@@ -0,0 +1,22 @@
+import os
+import shutil
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+_cache_root = None
+
+def pytest_configure(config):
+    # Keep the engine's on-disk caches out of the working tree during tests. This
+    # runs before test modules are collected, so QAEngine and http_cache read these
+    # variables when they are first imported
+    global _cache_root
+    _cache_root = tempfile.mkdtemp(prefix="samarth_tests_")
+    os.environ.setdefault("SAMARTH_RESULT_CACHE", os.path.join(_cache_root, "results"))
+    os.environ.setdefault("SAMARTH_HTTP_CACHE", os.path.join(_cache_root, "http"))
+
+def pytest_unconfigure(config):
+    if _cache_root is not None:
+        shutil.rmtree(_cache_root, ignore_errors=True)
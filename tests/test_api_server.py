@@ -0,0 +1,51 @@
+import threading
+
+import pytest
+import requests
+
+from api_server import make_server
+from load_test import http_target, main, run_load, server_peak_rss_mb
+
+@pytest.fixture(scope="module")
+def server():
+    server = make_server(port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+def test_ask_returns_the_engine_answer(server):
+    body = requests.get(f"{server}/ask", params={"question": "Compare rainfall in Gujarat and Maharashtra"}).json()
+    assert "Gujarat" in body["summary"]
+    assert {row["state"] for row in body["rainfall"]} <= {"Gujarat", "Maharashtra"}
+    assert body["citations"]
+
+def test_health_reports_the_server_peak_rss(server):
+    assert server_peak_rss_mb(f"{server}/ask") > 0
+    assert server_peak_rss_mb("http://127.0.0.1:9/ask", timeout=1) is None
+
+def test_scale_is_rejected_for_the_http_target():
+    with pytest.raises(SystemExit):
+        main(["--target", "http", "--scale", "2"])
+
+def test_missing_question_and_unknown_path(server):
+    assert requests.get(f"{server}/ask").status_code == 400
+    assert requests.get(f"{server}/nope").status_code == 404
+
+def test_load_run_counts_failures_instead_of_aborting(server):
+    def call(question):
+        if question == "boom":
+            raise RuntimeError("boom")
+        return http_target(f"{server}/ask")(question)
+    report = run_load(call, ["boom", "Compare rainfall in Gujarat and Maharashtra"], n_requests=10, concurrency=2)
+    assert report["warmup_errors"][0]["question"] == "boom"
+    assert 0 < report["error_rate"] < 1
+
+def test_scaled_run_removes_its_temporary_dataset(tmp_path, monkeypatch):
+    import tempfile
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    monkeypatch.setenv("SAMARTH_DATA_DIR", "")
+    report = tmp_path / "report.json"
+    main(["--scale", "2", "--requests", "2", "--output", str(report)])
+    assert report.exists()
+    assert [p.name for p in tmp_path.iterdir()] == ["report.json"]
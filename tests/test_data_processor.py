@@ -0,0 +1,37 @@
+import os
+
+import pandas as pd
+import pytest
+
+from conftest import ROOT
+from data_processor import DataProcessor
+
+@pytest.fixture(scope="module")
+def processor():
+    processor = DataProcessor()
+    processor.standardize_climate_data(pd.read_csv(os.path.join(ROOT, "rainfall_data.csv")))
+    processor.standardize_agriculture_data(pd.read_csv(os.path.join(ROOT, "crop_yield.csv")))
+    processor.merge_datasets()
+    return processor
+
+def test_fact_table_has_rows_with_rainfall_and_production(processor):
+    fact = processor.merged_data
+    both = fact.dropna(subset=["annual_mm", "production"])
+    assert len(both) > 10000
+    assert both[["state", "year"]].drop_duplicates().shape[0] > 600
+
+def test_climate_rainfall_wins_where_it_exists(processor):
+    fact = processor.merged_data
+    climate = processor.climate_data.set_index(["state", "year"])["annual_mm"]
+    rows = fact.set_index(["state", "year"]).loc[climate.index, "annual_mm"]
+    assert rows.groupby(level=[0, 1]).first().to_numpy() == pytest.approx(climate.sort_index().to_numpy())
+
+def test_sheet_rainfall_fills_missing_state_years(processor):
+    crop = processor.agriculture_data
+    punjab = crop[(crop["state"] == "Punjab") & (crop["year"] == 2010)]["annual_rainfall"].iloc[0]
+    fact = processor.merged_data
+    assert set(fact[(fact["state"] == "Punjab") & (fact["year"] == 2010)]["annual_mm"]) == {punjab}
+
+def test_fact_table_is_one_row_per_state_year_crop(processor):
+    fact = processor.merged_data.dropna(subset=["crop"])
+    assert not fact.duplicated(["state", "year", "crop"]).any()
@@ -0,0 +1,134 @@
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from http_cache import CachedHTTPClient, OfflineCacheMiss
+
+class StandInAPI:
+    """Local stand-in for api.data.gov.in: serves records per resource path with an ETag"""
+
+    def __init__(self):
+        self.hits = {"200": 0, "304": 0}
+        self.fail = False
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if api.fail:
+                    self.send_response(500)
+                    self.end_headers()
+                    return
+                resource = self.path.split("?")[0].strip("/")
+                etag = f'"{resource}-v1"'
+                if self.headers.get("If-None-Match") == etag:
+                    api.hits["304"] += 1
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                api.hits["200"] += 1
+                body = json.dumps({"records": [{"resource": resource, "n": i} for i in range(500)]}).encode()
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+@pytest.fixture
+def api():
+    server = StandInAPI()
+    yield server
+    server.close()
+
+@pytest.fixture
+def client(api, tmp_path):
+    # A plain session: the retrying default would back off on the stand-in's 500s
+    return CachedHTTPClient(cache_dir=str(tmp_path), base_url=api.url, max_age=3600, session=requests.Session())
+
+def test_repeat_fetch_is_served_from_disk(api, client):
+    first = client.get_json("crops", {"api-key": "a", "limit": 10})
+    second = client.get_json("crops", {"api-key": "a", "limit": 10})
+    assert first == second
+    assert api.hits["200"] == 1
+
+def test_api_key_is_not_part_of_the_cache_key(api, client):
+    client.get_json("crops", {"api-key": "a", "limit": 10})
+    client.get_json("crops", {"api-key": "b", "limit": 10})
+    assert api.hits["200"] == 1
+    assert client.cache_key("crops", {"api-key": "a"}) == client.cache_key("crops", {"api-key": "b"})
+    assert client.cache_key("crops", {"limit": 10}) != client.cache_key("crops", {"limit": 20})
+
+def test_stale_entry_is_revalidated_with_etag(api, client):
+    body = client.get_json("crops", {"limit": 10})
+    client.max_age = 0
+    assert client.get_json("crops", {"limit": 10}) == body
+    assert api.hits == {"200": 1, "304": 1}
+
+def test_offline_mode_serves_cache_and_raises_on_miss(api, client, tmp_path):
+    body = client.get_json("crops", {"limit": 10})
+    offline = CachedHTTPClient(cache_dir=str(tmp_path), base_url="http://127.0.0.1:9", offline=True,
+                               session=requests.Session())
+    assert offline.get_json("crops", {"limit": 10}) == body
+    with pytest.raises(OfflineCacheMiss):
+        offline.get_json("rain", {"limit": 10})
+    # Existing callers catch RequestException, which covers offline misses too
+    assert issubclass(OfflineCacheMiss, requests.exceptions.RequestException)
+
+def test_stale_copy_is_served_when_the_api_fails(api, client):
+    body = client.get_json("crops", {"limit": 10})
+    client.max_age = 0
+    api.fail = True
+    assert client.get_json("crops", {"limit": 10}) == body
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.get_json("rain", {"limit": 10})
+
+def test_eviction_drops_least_recently_used_entries(api, client, tmp_path):
+    client.get_json("r1", {})
+    blob_size = os.path.getsize(client._blob_path(client._load_entry(client.cache_key("r1", {}))["digest"]))
+    client.max_bytes = int(blob_size * 2.5)
+    client.get_json("r2", {})
+    client.get_json("r1", {})  # touch r1 so r2 is the least recently used
+    client.get_json("r3", {})
+    assert client._load_entry(client.cache_key("r2", {})) is None
+    assert client._load_entry(client.cache_key("r1", {})) is not None
+    assert client._load_entry(client.cache_key("r3", {})) is not None
+    blobs = [f for _, _, files in os.walk(tmp_path / "blobs") for f in files]
+    assert len(blobs) == 2
+
+def evict_blob_after_lookup(client, monkeypatch):
+    """Simulate another thread evicting the blob between _load_entry and the read"""
+    load_entry = client._load_entry
+
+    def racing_load_entry(key):
+        entry = load_entry(key)
+        if entry:
+            os.remove(client._blob_path(entry["digest"]))
+        return entry
+    monkeypatch.setattr(client, "_load_entry", racing_load_entry)
+
+def test_blob_evicted_during_a_fresh_hit_is_refetched(api, client, monkeypatch):
+    body = client.get_json("crops", {"limit": 10})
+    evict_blob_after_lookup(client, monkeypatch)
+    assert client.get_json("crops", {"limit": 10}) == body
+    assert api.hits["200"] == 2
+
+def test_blob_evicted_during_revalidation_is_refetched(api, client, monkeypatch):
+    body = client.get_json("crops", {"limit": 10})
+    client.max_age = 0
+    evict_blob_after_lookup(client, monkeypatch)
+    assert client.get_json("crops", {"limit": 10}) == body
+    assert api.hits == {"200": 2, "304": 1}
@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+import QAEngine as engine
+from warmup import run_warmup
+
+@pytest.fixture(autouse=True)
+def empty_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(engine, "RESULT_DIR", str(tmp_path))
+    monkeypatch.setattr(engine, "_results", engine.OrderedDict())
+
+def stored_files(path):
+    return [f for _, _, files in os.walk(path) for f in files]
+
+def test_answers_are_cached_in_memory_only(tmp_path):
+    question = "What were the top crops in Karnataka last 3 years?"
+    first = engine.answer_question(question)
+    assert engine.get_cached_result(question) is not None
+    assert stored_files(tmp_path) == []
+    assert engine.answer_question(question)[0] == first[0]
+
+def test_use_cache_false_runs_the_plan_and_stores_nothing(tmp_path, monkeypatch):
+    question = "Which state had the highest rainfall recently?"
+    engine.answer_question(question, use_cache=False)
+    assert engine.get_cached_result(question) is None
+    engine.answer_question(question)
+    # A cached copy exists now, but use_cache=False must still run the plan
+    calls = []
+    real = engine.plan_question
+    monkeypatch.setattr(engine, "plan_question", lambda *a: calls.append(a) or real(*a))
+    engine.answer_question(question, use_cache=False)
+    assert len(calls) == 1
+
+def test_warmup_persists_answers_to_disk(tmp_path):
+    questions = ["Which state had the highest rainfall recently?", "Rice in Punjab"]
+    metrics = run_warmup(questions)
+    assert metrics["questions"] == 2 and not metrics["failed"]
+    directory = f"{metrics['dataset_version']}-{metrics['code_version']}"
+    assert len(stored_files(tmp_path / directory)) == 2
+    engine._results.clear()
+    assert engine.get_cached_result("rice in  PUNJAB") is not None
+
+def test_warmup_replaces_a_stale_stored_answer():
+    question = "Rice in Punjab"
+    run_warmup([question])
+    stale = dict(engine.get_cached_result(question), summary="STALE")
+    engine.store_result(question, stale, persist=True)
+    engine._results.clear()
+    assert engine.get_cached_result(question)["summary"] == "STALE"
+    run_warmup([question])
+    assert engine.answer_question(question)[0] != "STALE"
+    engine._results.clear()
+    assert engine.get_cached_result(question)["summary"] != "STALE"
+
+def test_prune_keeps_only_the_current_dataset_and_code_version(tmp_path):
+    (tmp_path / "oldversion-oldcode").mkdir()
+    (tmp_path / f"{engine.dataset_version()}-oldcode").mkdir()
+    engine.store_result("Rice in Punjab", {"summary": "x"}, persist=True)
+    engine.prune_result_store()
+    assert os.listdir(tmp_path) == [engine._result_dir_name(engine.dataset_version())]
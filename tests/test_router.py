@@ -0,0 +1,54 @@
+import pytest
+
+import QAEngine as engine
+
+@pytest.mark.parametrize("question,intent", [
+    ("What were the most grown crops in Punjab?", "top_crops"),
+    ("Which crop had the highest production in Punjab?", "top_crops"),
+    ("Which crop had the highest production?", "top_crops"),
+    ("Which state had the highest rainfall?", "ranking"),
+    ("Where was rainfall lowest?", "ranking"),
+    ("Top crops in Punjab and Haryana", "top_crops"),
+    ("Compare rainfall in Gujarat and Maharashtra", "compare"),
+    ("Trend of rice in Punjab", "trend"),
+    ("Rice in Punjab", "lookup"),
+])
+def test_intents(question, intent):
+    assert engine.parse_question(question)["intent"] == intent
+
+@pytest.mark.parametrize("question,metric", [
+    ("Which state had the highest rainfall?", "rainfall"),
+    ("Which state gets the most rain?", "rainfall"),
+    ("Which state had the most brain drain in rice?", "production"),
+    ("Which state grows the most grain?", "production"),
+])
+def test_metric_matches_whole_words(question, metric):
+    assert engine.parse_question(question)["metric"] == metric
+
+def test_parsing_does_not_build_the_warehouse(monkeypatch):
+    monkeypatch.setattr(engine, "_current_warehouse", lambda: pytest.fail("warehouse built while parsing"))
+    params = engine.parse_question("Which crop had the highest production in Punjab?")
+    assert params["states"] == ["Punjab"]
+
+def test_lowest_crops_are_ranked_ascending():
+    parts = engine.answer_question("Which crop had the lowest production in Punjab?")
+    totals = parts[2]["total_prod"].tolist()
+    assert totals == sorted(totals)
+    assert set(parts[2]["state"]) == {"Punjab"}
+
+@pytest.mark.parametrize("question,states,crop", [
+    ("What is the price of wheat in Punjab?", ["Punjab"], "Wheat"),
+    ("Cotton(lint) output in Gujarat", ["Gujarat"], "Cotton(lint)"),
+    ("Rice in West Bengal", ["West Bengal"], "Rice"),
+])
+def test_names_match_whole_words(question, states, crop):
+    params = engine.parse_question(question)
+    assert params["states"] == states
+    assert params["crop_type"] == crop
+
+@pytest.mark.parametrize("question", engine.SUGGESTED_QUESTIONS)
+def test_every_suggestion_gets_a_real_answer(question):
+    summary, rainfall, top_crops, citations = engine.answer_question(question, use_cache=False)
+    assert not rainfall.empty or not top_crops.empty
+    assert summary and not summary.startswith(("No ", "Only "))
+    assert citations
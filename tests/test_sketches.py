@@ -0,0 +1,80 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import ROOT
+from data_processor import DataProcessor
+from sketches import ApproximateIndex, TDigest
+
+@pytest.fixture(scope="module")
+def crop():
+    return DataProcessor().standardize_agriculture_data(pd.read_csv(os.path.join(ROOT, "crop_yield.csv")))
+
+def exact_total(crop, state, name, start, end):
+    rows = crop[(crop["state"] == state) & (crop["crop"] == name) & crop["year"].between(start, end)]
+    return rows["production"].sum()
+
+def test_full_sample_estimate_is_exact(crop):
+    approx = ApproximateIndex(crop, sample_size=10 ** 6)
+    estimate, half_width = approx.estimate_total("Punjab", "Rice", 2005, 2015)
+    assert estimate == pytest.approx(exact_total(crop, "Punjab", "Rice", 2005, 2015))
+    assert half_width == 0.0
+
+def test_horvitz_thompson_interval_covers_the_truth(crop):
+    # Strata well above the sample size, so every estimate is a real estimate
+    sizes = crop.groupby(["state", "crop"]).size()
+    strata = sizes[sizes > 40].index[:10]
+    subset = crop.set_index(["state", "crop"]).loc[list(strata)].reset_index()
+    covered = trials = 0
+    for seed in range(20):
+        approx = ApproximateIndex(subset, sample_size=16, seed=seed)
+        for state, name in strata:
+            estimate, half_width = approx.estimate_total(state, name, 2000, 2015)
+            truth = exact_total(crop, state, name, 2000, 2015)
+            assert half_width > 0
+            covered += abs(estimate - truth) <= half_width
+            trials += 1
+    # Nominal 95%; allow slack for skewed production and the normal approximation
+    assert covered / trials >= 0.8
+
+def test_top_crops_match_exact_ranking_with_full_samples(crop):
+    approx = ApproximateIndex(crop, sample_size=10 ** 6)
+    top = approx.top_crops(["Gujarat"], 2010, 2019, k=3)
+    rows = crop[(crop["state"] == "Gujarat") & crop["year"].between(2010, 2019)]
+    expected = rows.groupby("crop")["production"].sum().nlargest(3)
+    assert list(top["crop"]) == list(expected.index)
+    assert top["total_prod"].to_numpy() == pytest.approx(expected.to_numpy())
+
+@pytest.mark.parametrize("q", [0.1, 0.5, 0.9])
+def test_tdigest_quantiles_are_close_in_rank(crop, q):
+    values = crop["yield"].dropna().to_numpy()
+    digest = TDigest(100).update(values)
+    estimate = digest.quantile(q)
+    # Compare by rank: the estimate's empirical CDF should be within 1% of q
+    assert np.mean(values <= estimate) == pytest.approx(q, abs=0.01)
+    assert digest.count == len(values)
+
+@pytest.mark.parametrize("q", [0.1, 0.5, 0.9])
+def test_quantile_bound_contains_the_exact_quantile(crop, q):
+    values = crop["yield"].dropna().to_numpy()
+    digest = TDigest(100).update(values)
+    bound = digest.quantile_bound(q)
+    assert bound > 0
+    exact = np.sort(values)[min(int(q * len(values)), len(values) - 1)]
+    assert abs(digest.quantile(q) - exact) <= bound
+
+def test_merged_digests_match_a_single_digest(crop):
+    values = crop["yield"].dropna().to_numpy()
+    halves = TDigest(100).update(values[::2]).merge(TDigest(100).update(values[1::2]))
+    assert np.mean(values <= halves.quantile(0.5)) == pytest.approx(0.5, abs=0.01)
+
+def test_yield_quantile_for_a_crop(crop):
+    approx = ApproximateIndex(crop)
+    median, bound = approx.yield_quantile("Punjab", 0.5, "Rice")
+    rows = crop[(crop["state"] == "Punjab") & (crop["crop"] == "Rice")]["yield"]
+    # Few enough rows that every value is its own centroid, so the median is exact
+    assert bound == 0.0
+    assert median == pytest.approx(rows.median())
+    assert np.isnan(approx.yield_quantile("Atlantis", 0.5)[0])
@@ -0,0 +1,49 @@
+import os
+
+import pandas as pd
+import pytest
+
+import QAEngine as engine
+from conftest import ROOT
+
+@pytest.fixture(scope="module")
+def raw():
+    return pd.read_csv(os.path.join(ROOT, "RS_Session_260_AU_1795_1.csv"))
+
+@pytest.fixture(scope="module")
+def events(raw):
+    return engine.normalize_station_events(raw)
+
+def test_na_cells_are_dropped(raw, events):
+    body = raw[~raw["Station Name"].str.startswith("Total")]
+    recorded = body[["2020", "2021", "2022"]].notna().sum().sum()
+    assert len(events) == recorded
+    assert events["events"].notna().all()
+
+def test_footer_row_is_excluded_but_matches_the_totals(raw, events):
+    assert not events["station"].str.lower().str.startswith("total").any()
+    footer = raw[raw["Station Name"].str.startswith("Total")].iloc[0]
+    totals = events.groupby("year")["events"].sum()
+    assert {year: totals[year] for year in (2020, 2021, 2022)} == {
+        year: int(footer[str(year)]) for year in (2020, 2021, 2022)}
+
+def test_station_names_are_cleaned_and_mapped(raw, events):
+    assert "Safdarjung (New Delhi )" in set(raw["Station Name"].str.strip())
+    assert "Safdarjung (New Delhi)" in set(events["station"])
+    assert events["state"].notna().all()
+    assert set(events["station"]) <= set(engine.STATION_STATES)
+
+def test_columns_are_typed(events):
+    assert pd.api.types.is_integer_dtype(events["events"])
+    assert pd.api.types.is_integer_dtype(events["year"])
+    assert list(events.columns) == ["station", "state", "year", "events"]
+
+def test_unmapped_stations_are_warned_about(raw, capsys):
+    extra = pd.concat([raw, pd.DataFrame([{"Sl. No.": 21, "Station Name": "Atlantis", "2020": 1}])])
+    events = engine.normalize_station_events(extra)
+    assert "Atlantis" in capsys.readouterr().out
+    assert events.loc[events["station"] == "Atlantis", "state"].isna().all()
+
+def test_melt_needs_year_columns():
+    with pytest.raises(ValueError):
+        engine.melt_year_columns(pd.DataFrame({"station": ["a"], "2020": [1]}), "station")
@@ -0,0 +1,45 @@
+import threading
+
+import pytest
+
+import QAEngine as engine
+
+STAGES = ["entities", "rainfall", "top_crops", "summary", "citations"]
+QUESTION = "What were the top crops in Karnataka last 3 years?"
+
+@pytest.fixture(autouse=True)
+def empty_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(engine, "RESULT_DIR", str(tmp_path))
+    monkeypatch.setattr(engine, "_results", engine.OrderedDict())
+
+def test_stages_arrive_in_order():
+    assert [stage for stage, _ in engine.stream_answer(QUESTION)] == STAGES
+
+def test_cached_answer_replays_the_same_stages(monkeypatch):
+    first = list(engine.stream_answer(QUESTION))
+    monkeypatch.setattr(engine, "plan_question", lambda *a: pytest.fail("plan ran for a cached answer"))
+    replay = list(engine.stream_answer(QUESTION))
+    assert [stage for stage, _ in replay] == STAGES
+    assert dict(replay)["summary"] == dict(first)["summary"]
+    assert dict(replay)["top_crops"].equals(dict(first)["top_crops"])
+
+def test_cancelled_stream_stores_nothing():
+    cancel = threading.Event()
+    seen = []
+    for stage, _ in engine.stream_answer(QUESTION, cancel=cancel):
+        seen.append(stage)
+        if stage == "rainfall":
+            cancel.set()
+    assert seen == ["entities", "rainfall"]
+    assert engine.get_cached_result(QUESTION) is None
+
+def test_closed_stream_stores_nothing():
+    stream = engine.stream_answer(QUESTION)
+    assert next(stream)[0] == "entities"
+    assert next(stream)[0] == "rainfall"
+    stream.close()
+    assert engine.get_cached_result(QUESTION) is None
+
+def test_stream_without_cache_stores_nothing():
+    assert [stage for stage, _ in engine.stream_answer(QUESTION, use_cache=False)] == STAGES
+    assert engine.get_cached_result(QUESTION) is None
@@ -0,0 +1,83 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import ROOT
+from data_processor import normalize_crop, normalize_rainfall
+from time_series import TimeSeriesIndex
+
+@pytest.fixture(scope="module")
+def crop():
+    data = normalize_crop(pd.read_csv(os.path.join(ROOT, "crop_yield.csv")))
+    data["crop"] = data["crop"].str.strip()
+    data["year"] = data["year"].astype(int)
+    return data
+
+@pytest.fixture(scope="module")
+def rain():
+    data = normalize_rainfall(pd.read_csv(os.path.join(ROOT, "rainfall_data.csv")))
+    data["year"] = data["year"].astype(int)
+    return data
+
+@pytest.fixture(scope="module")
+def crop_ts(crop):
+    return TimeSeriesIndex(crop, ["state", "crop"], "production")
+
+@pytest.fixture(scope="module")
+def rain_ts(rain):
+    return TimeSeriesIndex(rain, "state", "annual_mm")
+
+def brute_window(df, mask_cols, start, end, value_col):
+    rows = df[(df["year"] >= start) & (df["year"] <= end)]
+    for col, value in mask_cols.items():
+        rows = rows[rows[col] == value]
+    return rows[value_col].sum(), rows["year"].nunique()
+
+@pytest.mark.parametrize("key,start,end", [
+    (("Punjab", "Rice"), 2010, 2019),
+    (("Karnataka", "Sugarcane"), 1997, 2020),
+    (("Assam", "Arecanut"), 2015, 2015),
+])
+def test_window_sum_and_count_match_pandas(crop, crop_ts, key, start, end):
+    expected_sum, _ = brute_window(crop, {"state": key[0], "crop": key[1]}, start, end, "production")
+    rows = crop[(crop["state"] == key[0]) & (crop["crop"] == key[1])]
+    expected_years = rows[(rows["year"] >= start) & (rows["year"] <= end)]["year"].nunique()
+    assert crop_ts.window_sum(key, start, end) == pytest.approx(expected_sum)
+    assert crop_ts.window_count(key, start, end) == expected_years
+
+def test_window_mean_averages_observed_years(rain, rain_ts):
+    rows = rain[(rain["state"] == "Gujarat") & rain["year"].between(2021, 2022)]
+    assert rain_ts.window_mean("Gujarat", 2021, 2022) == pytest.approx(rows["annual_mm"].mean())
+
+def test_windows_are_clamped_to_the_data_range(rain, rain_ts):
+    whole = rain[rain["state"] == "Karnataka"]["annual_mm"].sum()
+    assert rain_ts.window_sum("Karnataka", 1900, 2100) == pytest.approx(whole)
+    assert rain_ts.window_count("Karnataka", 1900, 2100) == 3
+
+def test_empty_and_unknown_windows(rain_ts):
+    assert rain_ts.window_sum("Gujarat", 2030, 2035) == 0.0
+    assert rain_ts.window_count("Gujarat", 2022, 2020) == 0
+    assert np.isnan(rain_ts.window_mean("Gujarat", 2030, 2035))
+    assert np.isnan(rain_ts.window_sum("Atlantis", 2020, 2022))
+    assert np.isnan(rain_ts.growth_rate("Gujarat", 2030, 2035))
+
+def test_growth_rate_uses_window_endpoints(rain, rain_ts):
+    gujarat = rain[rain["state"] == "Gujarat"].set_index("year")["annual_mm"]
+    expected = (gujarat[2022] - gujarat[2020]) / gujarat[2020]
+    assert rain_ts.growth_rate("Gujarat", 2020, 2022) == pytest.approx(expected)
+
+def test_moving_average_matches_rolling_mean(rain, rain_ts):
+    gujarat = rain[rain["state"] == "Gujarat"].set_index("year")["annual_mm"].sort_index()
+    expected = gujarat.rolling(2, min_periods=1).mean()
+    moving = rain_ts.moving_average("Gujarat", 2)
+    assert moving.loc[expected.index].to_numpy() == pytest.approx(expected.to_numpy())
+
+def test_all_windows_returns_every_series_and_window(crop, crop_ts):
+    frame = crop_ts.all_windows((3, 5), end_year=2019)
+    assert len(frame) == 2 * len(crop_ts.keys)
+    five = frame[(frame["window"] == 5) & (frame["state"] == "Punjab") & (frame["crop"] == "Wheat")].iloc[0]
+    expected, _ = brute_window(crop, {"state": "Punjab", "crop": "Wheat"}, 2015, 2019, "production")
+    assert five["sum"] == pytest.approx(expected)
+    assert (five["start_year"], five["end_year"]) == (2015, 2019)
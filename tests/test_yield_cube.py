@@ -0,0 +1,56 @@
+import os
+
+import pandas as pd
+import pytest
+
+import QAEngine as engine
+from conftest import ROOT
+from data_processor import DataProcessor
+
+@pytest.fixture(scope="module")
+def crop():
+    return DataProcessor().standardize_agriculture_data(pd.read_csv(os.path.join(ROOT, "crop_yield.csv")))
+
+def brute(rows, by):
+    sums = (rows.assign(yield_area=rows["yield"] * rows["area"])
+            .groupby(by)[["production", "area", "fertilizer", "yield_area"]].sum().reset_index())
+    sums["yield"] = sums["yield_area"] / sums["area"]
+    sums["fertilizer_per_ha"] = sums["fertilizer"] / sums["area"]
+    return sums.sort_values(by).reset_index(drop=True)
+
+def test_grouping_ids_mark_rolled_up_dimensions():
+    cube = engine.get_warehouse().cursor().execute("""
+        SELECT grouping_id, BOOL_AND(state IS NULL) AS state, BOOL_AND(crop IS NULL) AS crop,
+               BOOL_AND(season IS NULL) AS season, BOOL_AND(year IS NULL) AS year
+        FROM yield_cube GROUP BY grouping_id
+    """).fetchdf().set_index("grouping_id")
+    assert sorted(cube.index) == list(range(16))
+    for gid, row in cube.iterrows():
+        for i, dim in enumerate(engine.CUBE_DIMENSIONS):
+            assert row[dim] == bool(gid >> (len(engine.CUBE_DIMENSIONS) - 1 - i) & 1)
+
+def test_grand_total_matches_pandas(crop):
+    cells = engine.query_yield_cube(measures=["yield"])
+    assert cells["production"].iloc[0] == pytest.approx(crop["production"].sum())
+    expected = (crop["yield"] * crop["area"]).sum() / crop["area"].sum()
+    assert cells["yield"].iloc[0] == pytest.approx(expected)
+
+def test_drill_down_with_slice_and_year_range_matches_pandas(crop):
+    cells = engine.query_yield_cube(by=["state", "season"], state=["Punjab", "Haryana"], crop="Wheat",
+                                    min_year=2005, max_year=2015, measures=["yield", "fertilizer_per_ha"])
+    rows = crop[crop["state"].isin(["Punjab", "Haryana"]) & (crop["crop"] == "Wheat")
+                & crop["year"].between(2005, 2015)]
+    expected = brute(rows, ["state", "season"])
+    assert list(zip(cells["state"], cells["season"])) == list(zip(expected["state"], expected["season"]))
+    for col in ("production", "area", "yield", "fertilizer_per_ha"):
+        assert cells[col].to_numpy() == pytest.approx(expected[col].to_numpy())
+
+def test_order_by_a_measure(crop):
+    cells = engine.query_yield_cube(by=["state"], crop="Rice", measures=["yield"], order_by="yield", descending=False)
+    expected = brute(crop[crop["crop"] == "Rice"], ["state"]).sort_values("yield")
+    assert list(cells["state"]) == list(expected["state"])
+
+def test_highest_yield_question_ranks_states():
+    summary, _, cells, _ = engine.answer_question("Which state had the highest rice yield?")
+    assert cells["yield"].is_monotonic_decreasing
+    assert summary.startswith(f"{cells['state'].iloc[0]} had the highest yield")
@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+
+class TimeSeriesIndex:
+    """Prefix sums and counts over yearly series, one row per key.
+
+    Every key (e.g. a state, or a (state, crop) pair) gets a dense row covering
+    the full year range, so any window sum, mean or endpoint lookup is two
+    array reads regardless of window length. Missing years count as zero with
+    a zero observation count, so means only average the years actually seen.
+    """
+
+    def __init__(self, df, key_cols, value_col, year_col="year"):
+        if isinstance(key_cols, str):
+            key_cols = [key_cols]
+        self.key_cols = list(key_cols)
+        data = df.dropna(subset=[value_col, year_col] + self.key_cols)
+        data = data.groupby(self.key_cols + [year_col], as_index=False)[value_col].sum()
+        if data.empty:
+            raise ValueError(f"No '{value_col}' values available to build a time series.")
+        data[year_col] = data[year_col].astype(int)
+
+        self.first_year = int(data[year_col].min())
+        self.last_year = int(data[year_col].max())
+        n_years = self.last_year - self.first_year + 1
+
+        keys = data[self.key_cols].drop_duplicates().itertuples(index=False, name=None)
+        self.keys = [k if len(self.key_cols) > 1 else k[0] for k in keys]
+        self.key_rows = {k: i for i, k in enumerate(self.keys)}
+
+        row_idx = np.fromiter(
+            (self.key_rows[k if len(self.key_cols) > 1 else k[0]]
+             for k in data[self.key_cols].itertuples(index=False, name=None)),
+            dtype=np.int64, count=len(data))
+        col_idx = data[year_col].to_numpy() - self.first_year
+
+        self.values = np.full((len(self.keys), n_years), np.nan)
+        self.values[row_idx, col_idx] = data[value_col].to_numpy(dtype=float)
+        observed = ~np.isnan(self.values)
+        # Leading zero column so a window [a, b] is prefix[b + 1] - prefix[a]
+        self.prefix_sum = np.zeros((len(self.keys), n_years + 1))
+        self.prefix_sum[:, 1:] = np.cumsum(np.where(observed, self.values, 0.0), axis=1)
+        self.prefix_count = np.zeros((len(self.keys), n_years + 1), dtype=np.int64)
+        self.prefix_count[:, 1:] = np.cumsum(observed, axis=1)
+
+    # ------------------ Single-series lookups -------------------
+
+    def _bounds(self, start_year, end_year):
+        start = max(int(start_year), self.first_year) - self.first_year
+        end = min(int(end_year), self.last_year) - self.first_year
+        return start, end
+
+    def __contains__(self, key):
+        return key in self.key_rows
+
+    def window_sum(self, key, start_year, end_year):
+        """Sum of the series over [start_year, end_year]"""
+        if key not in self.key_rows:
+            return np.nan
+        start, end = self._bounds(start_year, end_year)
+        if start > end:
+            return 0.0
+        row = self.key_rows[key]
+        return float(self.prefix_sum[row, end + 1] - self.prefix_sum[row, start])
+
+    def window_count(self, key, start_year, end_year):
+        """Number of observed years in [start_year, end_year]"""
+        if key not in self.key_rows:
+            return 0
+        start, end = self._bounds(start_year, end_year)
+        if start > end:
+            return 0
+        row = self.key_rows[key]
+        return int(self.prefix_count[row, end + 1] - self.prefix_count[row, start])
+
+    def window_mean(self, key, start_year, end_year):
+        """Mean over the observed years in [start_year, end_year]; NaN when none were observed"""
+        count = self.window_count(key, start_year, end_year)
+        return self.window_sum(key, start_year, end_year) / count if count else np.nan
+
+    def growth_rate(self, key, start_year, end_year):
+        """Fractional change between the values at start_year and end_year"""
+        if key not in self.key_rows:
+            return np.nan
+        start, end = self._bounds(start_year, end_year)
+        if start > end:
+            return np.nan
+        row = self.key_rows[key]
+        first, last = self.values[row, start], self.values[row, end]
+        if np.isnan(first) or np.isnan(last) or first == 0:
+            return np.nan
+        return float((last - first) / first)
+
+    def moving_average(self, key, width):
+        """Trailing `width`-year moving average of one series, indexed by year"""
+        row = self.key_rows[key]
+        width = max(int(width), 1)
+        ends = np.arange(1, self.prefix_sum.shape[1])
+        starts = np.maximum(ends - width, 0)
+        sums = self.prefix_sum[row, ends] - self.prefix_sum[row, starts]
+        counts = self.prefix_count[row, ends] - self.prefix_count[row, starts]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.where(counts > 0, sums / counts, np.nan)
+        return pd.Series(means, index=np.arange(self.first_year, self.last_year + 1), name=key)
+
+    # ------------------ Vectorized lookups -------------------
+
+    def keys_frame(self):
+        """DataFrame of the series keys, one row per series in index order"""
+        return pd.DataFrame([k if isinstance(k, tuple) else (k,) for k in self.keys], columns=self.key_cols)
+
+    def window_frame(self, start_year, end_year):
+        """Sum, count, mean and growth for every series over one window"""
+        start, end = self._bounds(start_year, end_year)
+        frame = self.keys_frame()
+        frame["start_year"] = start + self.first_year
+        frame["end_year"] = end + self.first_year
+        if start > end:
+            frame["sum"], frame["count"], frame["mean"], frame["growth"] = 0.0, 0, np.nan, np.nan
+            return frame
+        sums = self.prefix_sum[:, end + 1] - self.prefix_sum[:, start]
+        counts = self.prefix_count[:, end + 1] - self.prefix_count[:, start]
+        first, last = self.values[:, start], self.values[:, end]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            frame["sum"] = sums
+            frame["count"] = counts
+            frame["mean"] = np.where(counts > 0, sums / counts, np.nan)
+            frame["growth"] = np.where(first != 0, (last - first) / first, np.nan)
+        return frame
+
+    def all_windows(self, windows=(3, 5, 10), end_year=None):
+        """Trailing windows of each length ending at end_year, for every series in one call"""
+        end_year = self.last_year if end_year is None else int(end_year)
+        frames = []
+        for width in windows:
+            frame = self.window_frame(end_year - int(width) + 1, end_year)
+            frame.insert(len(self.key_cols), "window", int(width))
+            frames.append(frame)
+        return pd.concat(frames, ignore_index=True)
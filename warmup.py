@@ -0,0 +1,66 @@
+# Deploy-time warm-up: python warmup.py --questions popular.jsonl --output warmup_metrics.json
+import argparse
+import json
+import sys
+import time
+
+from questions import load_questions
+
+def run_warmup(questions, prune=True):
+    """Build the warehouse and recompute every question into the on-disk result store.
+
+    Returns a metrics dict; warmup_duration_seconds is the deployment metric
+    (warehouse build plus all answers). Results from older dataset versions
+    are pruned so the store only holds answers for the data being served.
+    """
+    import QAEngine as engine
+    started = time.perf_counter()
+    version = engine.dataset_version()
+    engine.get_warehouse()
+    build_seconds = time.perf_counter() - started
+
+    qa = engine.QAEngine()
+    answered, failed, timings = 0, [], {}
+    for question in dict.fromkeys(questions):
+        t0 = time.perf_counter()
+        try:
+            qa.process_question(question, persist=True, refresh=True)
+            answered += 1
+        except Exception as e:
+            failed.append({"question": question, "error": f"{type(e).__name__}: {e}"})
+        timings[question] = round((time.perf_counter() - t0) * 1000, 2)
+    if prune:
+        engine.prune_result_store(version)
+
+    return {
+        "metric": "warmup_duration_seconds",
+        "value": round(time.perf_counter() - started, 3),
+        "dataset_version": version,
+        "code_version": engine.RESULT_CODE_VERSION,
+        "warehouse_build_seconds": round(build_seconds, 3),
+        "questions": answered,
+        "failed": failed,
+        "question_ms": timings,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute answers for the suggestion list and popular questions.")
+    parser.add_argument("--questions", help="JSONL file of popular {\"question\": ...} lines to warm as well")
+    parser.add_argument("--no-suggestions", action="store_true", help="Skip the landing-page suggestion list")
+    parser.add_argument("--keep-old", action="store_true", help="Keep stored answers from older dataset versions")
+    parser.add_argument("--output", help="Also write the metrics JSON to this file")
+    args = parser.parse_args(argv)
+
+    questions = load_questions(args.questions, include_suggestions=not args.no_suggestions)
+    metrics = run_warmup(questions, prune=not args.keep_old)
+
+    text = json.dumps(metrics, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    # Fail the deploy step if any suggested or popular question cannot be answered
+    return 1 if metrics["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())